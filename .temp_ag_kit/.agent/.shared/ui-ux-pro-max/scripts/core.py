@@ -5,10 +5,14 @@ UI/UX Pro Max Core - BM25 search engine for UI/UX style guides
 """
 
 import csv
+import os
 import re
+import sys
+from time import perf_counter, time
 from pathlib import Path
 from math import log
 from collections import defaultdict
+from collections.abc import Mapping
 
 # ============ CONFIGURATION ============
 DATA_DIR = Path(__file__).parent.parent / "data"
@@ -95,20 +99,147 @@ _STACK_COLS = {
 
 AVAILABLE_STACKS = list(STACK_CONFIG.keys())
 
+# Fitted indexes keyed by (files, search columns, fuzzy); reused across searches in one process
+_INDEX_CACHE = {}
+
+
+# ============ PROFILING ============
+# Opt-in query profiling: set UIPRO_PROFILE=1 (JSON lines on stderr) or
+# UIPRO_PROFILE=<file.jsonl> (appended), or pass --profile to search.py.
+PROFILE_ENV = "UIPRO_PROFILE"
+_profile_sink = os.environ.get(PROFILE_ENV) or None
+_active_profiles = []
+
+
+def enable_profiling(sink="-"):
+    """Turn on profiling; sink is "-" for stderr or a JSONL file path"""
+    global _profile_sink
+    _profile_sink = sink
+
+
+class profile_op:
+    """
+    Context manager recording one operation (search, search_stack, generate...).
+
+    Stage timings and counters from nested calls are added to every active
+    operation, and each operation emits one JSON line when it exits.
+    """
+
+    __slots__ = ("op", "meta", "stages", "counts", "start")
+
+    def __init__(self, op, **meta):
+        self.op = op
+        self.meta = meta
+        self.stages = {}
+        self.counts = {}
+
+    def __enter__(self):
+        if _profile_sink:
+            self.start = perf_counter()
+            _active_profiles.append(self)
+        return self
+
+    def __exit__(self, *exc):
+        if _profile_sink and _active_profiles and _active_profiles[-1] is self:
+            _active_profiles.pop()
+            _emit_profile({
+                "ts": round(time(), 3),
+                "op": self.op,
+                "parent": _active_profiles[-1].op if _active_profiles else None,
+                **self.meta,
+                "total_ms": round((perf_counter() - self.start) * 1000, 3),
+                "stages_ms": {k: round(v * 1000, 3) for k, v in self.stages.items()},
+                "counts": self.counts,
+            })
+        return False
+
+
+class profile_stage:
+    """Context manager timing a stage: load, tokenize, fit, score, select, format"""
+
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        if _active_profiles:
+            self.start = perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        if _active_profiles:
+            elapsed = perf_counter() - self.start
+            for record in _active_profiles:
+                record.stages[self.name] = record.stages.get(self.name, 0) + elapsed
+        return False
+
+
+def profile_count(name, n=1):
+    """Add n to a counter on every active operation"""
+    for record in _active_profiles:
+        record.counts[name] = record.counts.get(name, 0) + n
+
+
+def _emit_profile(event):
+    import json
+    line = json.dumps(event, ensure_ascii=False, default=str)
+    if _profile_sink in ("-", "1", "true", "stderr"):
+        print(line, file=sys.stderr)
+    else:
+        with open(_profile_sink, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
 
 # ============ BM25 IMPLEMENTATION ============
+# Fuzzy expansion: misspelled, truncated or inflected query tokens are mapped
+# onto vocabulary terms. Candidates are capped so scoring cost stays bounded.
+NGRAM_SIZE = 3
+FUZZY_MAX_EXPANSIONS = 5
+FUZZY_MIN_SIMILARITY = 0.5
+FUZZY_STEM_WEIGHT = 0.9
+FUZZY_PREFIX_WEIGHT = 0.8
+FUZZY_NGRAM_WEIGHT = 0.6
+
+# Longest suffix first; "ies" maps back to "y" (categories -> category)
+_STEM_SUFFIXES = ("ations", "ation", "ments", "ment", "ness", "ings", "ing",
+                  "ies", "ers", "er", "ed", "es", "ly", "s")
+
+
+def stem(word):
+    """Light suffix-stripping stemmer (plurals, -ing, -ed, -ation, ...)"""
+    for suffix in _STEM_SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            return word[:-len(suffix)] + ("y" if suffix == "ies" else "")
+    return word
+
+
+def _ngrams(word, n=NGRAM_SIZE):
+    """Character n-grams of a word, padded so short words still produce one"""
+    padded = f" {word} "
+    return {padded[i:i + n] for i in range(len(padded) - n + 1)}
+
+
 class BM25:
     """BM25 ranking algorithm for text search"""
 
-    def __init__(self, k1=1.5, b=0.75):
+    def __init__(self, k1=1.5, b=0.75, fuzzy=False):
         self.k1 = k1
         self.b = b
+        self.fuzzy = fuzzy
         self.corpus = []
+        self.term_freqs = []
         self.doc_lengths = []
         self.avgdl = 0
         self.idf = {}
         self.doc_freqs = defaultdict(int)
         self.N = 0
+        # Fuzzy indexes (only built when fuzzy=True)
+        self.stems = defaultdict(set)
+        self.prefixes = defaultdict(list)
+        self.ngram_index = defaultdict(set)
+        self.ngram_sizes = {}
+        self._expansions = {}
 
     def tokenize(self, text):
         """Lowercase, split, remove punctuation, filter short words"""
@@ -117,46 +248,159 @@ class BM25:
 
     def fit(self, documents):
         """Build BM25 index from documents"""
-        self.corpus = [self.tokenize(doc) for doc in documents]
+        with profile_stage("tokenize"):
+            self.corpus = [self.tokenize(doc) for doc in documents]
         self.N = len(self.corpus)
         if self.N == 0:
             return
-        self.doc_lengths = [len(doc) for doc in self.corpus]
-        self.avgdl = sum(self.doc_lengths) / self.N
 
-        for doc in self.corpus:
-            seen = set()
-            for word in doc:
-                if word not in seen:
+        with profile_stage("fit"):
+            self.doc_lengths = [len(doc) for doc in self.corpus]
+            self.avgdl = sum(self.doc_lengths) / self.N
+
+            for doc in self.corpus:
+                term_freqs = defaultdict(int)
+                for word in doc:
+                    term_freqs[word] += 1
+                self.term_freqs.append(term_freqs)
+                for word in term_freqs:
                     self.doc_freqs[word] += 1
-                    seen.add(word)
 
-        for word, freq in self.doc_freqs.items():
-            self.idf[word] = log((self.N - freq + 0.5) / (freq + 0.5) + 1)
+            for word, freq in self.doc_freqs.items():
+                self.idf[word] = log((self.N - freq + 0.5) / (freq + 0.5) + 1)
+
+            if self.fuzzy:
+                self._build_fuzzy_index()
+        profile_count("docs_indexed", self.N)
+        profile_count("vocabulary", len(self.idf))
+
+    def _build_fuzzy_index(self):
+        """Precompute stems, prefix buckets and n-gram postings for the vocabulary"""
+        for word in self.idf:
+            self.stems[stem(word)].add(word)
+            self.prefixes[word[:NGRAM_SIZE]].append(word)
+            grams = _ngrams(word)
+            self.ngram_sizes[word] = len(grams)
+            for gram in grams:
+                self.ngram_index[gram].add(word)
+
+    def _expand(self, token):
+        """Map a query token to weighted vocabulary terms"""
+        if not self.fuzzy:
+            return [(token, 1.0)] if token in self.idf else []
+        if token in self._expansions:
+            return self._expansions[token]
+
+        weights = {}
+        if token in self.idf:
+            weights[token] = 1.0
+        for word in self.stems.get(stem(token), ()):
+            weights.setdefault(word, FUZZY_STEM_WEIGHT)
+
+        if token not in self.idf:
+            # Prefix match in either direction: "glassmorph" -> "glassmorphism", "navbar" -> "nav"
+            for word in self.prefixes.get(token[:NGRAM_SIZE], ()):
+                shorter, longer = sorted((word, token), key=len)
+                coverage = len(shorter) / len(longer)
+                if longer.startswith(shorter) and coverage >= FUZZY_MIN_SIMILARITY:
+                    weights.setdefault(word, FUZZY_PREFIX_WEIGHT * coverage)
+
+            # N-gram (Dice) similarity for typos and other inflections
+            grams = _ngrams(token)
+            shared = defaultdict(int)
+            for gram in grams:
+                for word in self.ngram_index.get(gram, ()):
+                    shared[word] += 1
+            for word, count in shared.items():
+                similarity = 2 * count / (len(grams) + self.ngram_sizes[word])
+                if similarity >= FUZZY_MIN_SIMILARITY:
+                    weights.setdefault(word, FUZZY_NGRAM_WEIGHT * similarity)
+
+        # Keep the candidate set bounded; exact hits always sort first
+        ranked = sorted(weights.items(), key=lambda x: (-x[1], x[0]))[:FUZZY_MAX_EXPANSIONS]
+        self._expansions[token] = ranked
+        return ranked
 
     def score(self, query):
         """Score all documents against query"""
-        query_tokens = self.tokenize(query)
+        with profile_stage("tokenize"):
+            query_terms = [self._expand(token) for token in self.tokenize(query)]
+        with profile_stage("score"):
+            scores, touched = self._score_terms(query_terms)
+        profile_count("docs_scored", len(scores))
+        profile_count("postings_touched", touched)
+        profile_count("query_terms", sum(len(expansions) for expansions in query_terms))
+        return scores
+
+    def _score_terms(self, query_terms):
+        """Score and rank all documents; also returns the number of postings hit"""
         scores = []
+        touched = 0
 
-        for idx, doc in enumerate(self.corpus):
+        for idx, term_freqs in enumerate(self.term_freqs):
             score = 0
             doc_len = self.doc_lengths[idx]
-            term_freqs = defaultdict(int)
-            for word in doc:
-                term_freqs[word] += 1
-
-            for token in query_tokens:
-                if token in self.idf:
-                    tf = term_freqs[token]
-                    idf = self.idf[token]
-                    numerator = tf * (self.k1 + 1)
-                    denominator = tf + self.k1 * (1 - self.b + self.b * doc_len / self.avgdl)
-                    score += idf * numerator / denominator
+            norm = self.k1 * (1 - self.b + self.b * doc_len / self.avgdl)
+
+            for expansions in query_terms:
+                # Best-matching expansion only, so variants of one token don't stack
+                best = 0
+                for term, weight in expansions:
+                    tf = term_freqs.get(term, 0)
+                    if tf:
+                        touched += 1
+                        numerator = tf * (self.k1 + 1)
+                        denominator = tf + norm
+                        best = max(best, weight * self.idf[term] * numerator / denominator)
+                score += best
 
             scores.append((idx, score))
 
-        return sorted(scores, key=lambda x: x[1], reverse=True)
+        return sorted(scores, key=lambda x: x[1], reverse=True), touched
+
+
+# ============ RESULT RECORDS ============
+class SearchResult(Mapping):
+    """
+    Read-only view of one matched CSV row, limited to the output columns.
+
+    References the loaded row instead of copying it; use to_dict() (or
+    dict(result)) at serialization boundaries.
+    """
+
+    __slots__ = ("row", "columns", "score", "stack")
+
+    def __init__(self, row, columns, score=0.0, stack=None):
+        self.row = row
+        self.columns = columns
+        self.score = score
+        self.stack = stack
+
+    def __getitem__(self, key):
+        if key == "Stack" and self.stack is not None:
+            return self.stack
+        if key in self.columns:
+            return self.row[key]
+        raise KeyError(key)
+
+    def __iter__(self):
+        if self.stack is not None:
+            yield "Stack"
+        yield from self.columns
+
+    def __len__(self):
+        return len(self.columns) + (self.stack is not None)
+
+    def to_dict(self):
+        return dict(self.items())
+
+    def __repr__(self):
+        return repr(self.to_dict())
+
+
+def _present_columns(header, output_cols):
+    """Output columns that exist in a CSV header, in output order"""
+    return tuple(col for col in output_cols if col in header)
 
 
 # ============ SEARCH FUNCTIONS ============
@@ -166,27 +410,72 @@ def _load_csv(filepath):
         return list(csv.DictReader(f))
 
 
-def _search_csv(filepath, search_cols, output_cols, query, max_results):
+def _get_index(filepaths, search_cols, fuzzy=False):
+    """
+    Load one or more CSVs into a single BM25 index, cached per process.
+
+    Returns (rows, partitions, headers, bm25) where partitions[i] is the
+    position in filepaths of the file row i came from and headers[p] is the
+    column set of file p.
+    """
+    key = (tuple(filepaths), tuple(search_cols), fuzzy)
+    if key in _INDEX_CACHE:
+        profile_count("index_cache_hits")
+    else:
+        rows, partitions, headers = [], [], []
+        with profile_stage("load"):
+            for part, filepath in enumerate(filepaths):
+                data = _load_csv(filepath)
+                rows.extend(data)
+                partitions.extend([part] * len(data))
+                headers.append(set(data[0]) if data else set())
+        profile_count("csv_files", len(filepaths))
+        profile_count("rows_loaded", len(rows))
+
+        # Build documents from search columns
+        documents = [" ".join(str(row.get(col, "")) for col in search_cols) for row in rows]
+        bm25 = BM25(fuzzy=fuzzy)
+        bm25.fit(documents)
+        _INDEX_CACHE[key] = (rows, partitions, headers, bm25)
+    return _INDEX_CACHE[key]
+
+
+def _search_csv(filepath, search_cols, output_cols, query, max_results, fuzzy=False):
     """Core search function using BM25"""
     if not filepath.exists():
         return []
 
-    data = _load_csv(filepath)
+    data, _, headers, bm25 = _get_index([filepath], search_cols, fuzzy)
+    ranked = bm25.score(query)
 
-    # Build documents from search columns
-    documents = [" ".join(str(row.get(col, "")) for col in search_cols) for row in data]
+    # Get top results with score > 0
+    with profile_stage("select"):
+        columns = _present_columns(headers[0], output_cols)
+        results = []
+        for idx, score in ranked[:max_results]:
+            if score > 0:
+                results.append(SearchResult(data[idx], columns, score))
+
+    return results
 
-    # BM25 search
-    bm25 = BM25()
-    bm25.fit(documents)
+
+def _search_partitioned(filepaths, labels, search_cols, output_cols, query, per_partition, fuzzy=False):
+    """Search a merged index, keeping at most per_partition results from each file"""
+    data, partitions, headers, bm25 = _get_index(filepaths, search_cols, fuzzy)
     ranked = bm25.score(query)
 
-    # Get top results with score > 0
-    results = []
-    for idx, score in ranked[:max_results]:
-        if score > 0:
-            row = data[idx]
-            results.append({col: row.get(col, "") for col in output_cols if col in row})
+    # Results merge by score; a partition stops contributing once its quota is met
+    with profile_stage("select"):
+        columns = [_present_columns(header, output_cols) for header in headers]
+        results = []
+        taken = [0] * len(filepaths)
+        for idx, score in ranked:
+            if score <= 0 or len(results) == per_partition * len(filepaths):
+                break
+            part = partitions[idx]
+            if taken[part] < per_partition:
+                taken[part] += 1
+                results.append(SearchResult(data[idx], columns[part], score, labels[part]))
 
     return results
 
@@ -214,7 +503,7 @@ def detect_domain(query):
     return best if scores[best] > 0 else "style"
 
 
-def search(query, domain=None, max_results=MAX_RESULTS):
+def search(query, domain=None, max_results=MAX_RESULTS, fuzzy=False):
     """Main search function with auto-domain detection"""
     if domain is None:
         domain = detect_domain(query)
@@ -225,7 +514,9 @@ def search(query, domain=None, max_results=MAX_RESULTS):
     if not filepath.exists():
         return {"error": f"File not found: {filepath}", "domain": domain}
 
-    results = _search_csv(filepath, config["search_cols"], config["output_cols"], query, max_results)
+    with profile_op("search", domain=domain, query=query, fuzzy=fuzzy):
+        results = _search_csv(filepath, config["search_cols"], config["output_cols"], query, max_results, fuzzy)
+        profile_count("results", len(results))
 
     return {
         "domain": domain,
@@ -236,23 +527,48 @@ def search(query, domain=None, max_results=MAX_RESULTS):
     }
 
 
-def search_stack(query, stack, max_results=MAX_RESULTS):
-    """Search stack-specific guidelines"""
-    if stack not in STACK_CONFIG:
-        return {"error": f"Unknown stack: {stack}. Available: {', '.join(AVAILABLE_STACKS)}"}
+def _resolve_stacks(stack):
+    """Normalize a stack argument: name, comma-separated names, list, or 'all'"""
+    if isinstance(stack, str):
+        stack = [s.strip() for s in stack.split(",") if s.strip()]
+    if "all" in stack:
+        return list(AVAILABLE_STACKS)
+    return list(dict.fromkeys(stack))
 
-    filepath = DATA_DIR / STACK_CONFIG[stack]["file"]
 
-    if not filepath.exists():
-        return {"error": f"Stack file not found: {filepath}", "stack": stack}
+def search_stack(query, stack, max_results=MAX_RESULTS, fuzzy=False):
+    """
+    Search stack-specific guidelines.
+
+    stack may be a single stack, several (list or comma-separated), or "all".
+    Several stacks are searched through one merged index; results merge by
+    score with at most max_results per stack.
+    """
+    stacks = _resolve_stacks(stack)
+    unknown = [s for s in stacks if s not in STACK_CONFIG]
+    if unknown or not stacks:
+        return {"error": f"Unknown stack: {', '.join(unknown) or stack}. Available: {', '.join(AVAILABLE_STACKS)}, all"}
+
+    files = [STACK_CONFIG[s]["file"] for s in stacks]
+    filepaths = [DATA_DIR / f for f in files]
+
+    for s, filepath in zip(stacks, filepaths):
+        if not filepath.exists():
+            return {"error": f"Stack file not found: {filepath}", "stack": s}
 
-    results = _search_csv(filepath, _STACK_COLS["search_cols"], _STACK_COLS["output_cols"], query, max_results)
+    with profile_op("search_stack", stacks=stacks, query=query, fuzzy=fuzzy):
+        if len(stacks) == 1:
+            results = _search_csv(filepaths[0], _STACK_COLS["search_cols"], _STACK_COLS["output_cols"], query, max_results, fuzzy)
+        else:
+            results = _search_partitioned(filepaths, stacks, _STACK_COLS["search_cols"], _STACK_COLS["output_cols"],
+                                          query, max_results, fuzzy)
+        profile_count("results", len(results))
 
     return {
         "domain": "stack",
-        "stack": stack,
+        "stack": ", ".join(stacks),
         "query": query,
-        "file": STACK_CONFIG[stack]["file"],
+        "file": ", ".join(files),
         "count": len(results),
         "results": results
     }
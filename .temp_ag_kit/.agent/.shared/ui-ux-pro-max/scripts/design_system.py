@@ -15,10 +15,8 @@ Usage:
 
 import csv
 import json
-import os
-from datetime import datetime
 from pathlib import Path
-from core import search, DATA_DIR
+from core import search, DATA_DIR, profile_op, profile_stage
 
 
 # ============ CONFIGURATION ============
@@ -45,7 +43,7 @@ class DesignSystemGenerator:
         filepath = DATA_DIR / REASONING_FILE
         if not filepath.exists():
             return []
-        with open(filepath, 'r', encoding='utf-8') as f:
+        with profile_stage("load"), open(filepath, 'r', encoding='utf-8') as f:
             return list(csv.DictReader(f))
 
     def _multi_domain_search(self, query: str, style_priority: list = None) -> dict:
@@ -162,6 +160,10 @@ class DesignSystemGenerator:
 
     def generate(self, query: str, project_name: str = None) -> dict:
         """Generate complete design system recommendation."""
+        with profile_op("generate", query=query):
+            return self._generate(query, project_name)
+
+    def _generate(self, query: str, project_name: str = None) -> dict:
         # Step 1: First search product to get category
         product_result = search(query, "product", 1)
         product_results = product_result.get("results", [])
@@ -482,9 +484,10 @@ def generate_design_system(query: str, project_name: str = None, output_format:
     if persist:
         persist_design_system(design_system, page, output_dir, query)
 
-    if output_format == "markdown":
-        return format_markdown(design_system)
-    return format_ascii_box(design_system)
+    with profile_stage("format"):
+        if output_format == "markdown":
+            return format_markdown(design_system)
+        return format_ascii_box(design_system)
 
 
 # ============ PERSISTENCE FUNCTIONS ============
@@ -549,6 +552,7 @@ def format_master_md(design_system: dict) -> str:
     effects = design_system.get("key_effects", "")
     anti_patterns = design_system.get("anti_patterns", "")
     
+    from datetime import datetime  # only needed when persisting
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     
     lines = []
@@ -805,6 +809,7 @@ def format_master_md(design_system: dict) -> str:
 def format_page_override_md(design_system: dict, page_name: str, page_query: str = None) -> str:
     """Format a page-specific override file with intelligent AI-generated content."""
     project = design_system.get("project_name", "PROJECT")
+    from datetime import datetime  # only needed when persisting
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     page_title = page_name.replace("-", " ").replace("_", " ").title()
     
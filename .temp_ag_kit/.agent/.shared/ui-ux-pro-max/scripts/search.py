@@ -2,21 +2,31 @@
 # -*- coding: utf-8 -*-
 """
 UI/UX Pro Max Search - BM25 search engine for UI/UX style guides
-Usage: python search.py "<query>" [--domain <domain>] [--stack <stack>] [--max-results 3]
+Usage: python search.py "<query>" [--domain <domain>] [--stack <stack>[,<stack>...]|all] [--max-results 3] [--fuzzy]
        python search.py "<query>" --design-system [-p "Project Name"]
        python search.py "<query>" --design-system --persist [-p "Project Name"] [--page "dashboard"]
 
 Domains: style, prompt, color, chart, landing, product, ux, typography
-Stacks: html-tailwind, react, nextjs
+Stacks: html-tailwind, react, nextjs, vue, nuxtjs, nuxt-ui, svelte, swiftui, react-native,
+        flutter, shadcn, jetpack-compose (comma-separate several, or use "all")
 
 Persistence (Master + Overrides pattern):
   --persist    Save design system to design-system/MASTER.md
   --page       Also create a page-specific override file in design-system/pages/
+
+Profiling:
+  --profile (or UIPRO_PROFILE=1 / UIPRO_PROFILE=<file.jsonl>) emits one JSON
+  line per search/search_stack/generate call with per-stage timings
+  (load, tokenize, fit, score, select, format) and counts.
+
+Startup budget (python -X importtime search.py "<query>"):
+  Plain domain/stack searches import only core and argparse. design_system,
+  json and datetime are imported lazily on the paths that need them.
 """
 
-import argparse
-from core import CSV_CONFIG, AVAILABLE_STACKS, MAX_RESULTS, search, search_stack
-from design_system import generate_design_system, persist_design_system
+import sys
+from core import (CSV_CONFIG, AVAILABLE_STACKS, MAX_RESULTS, SearchResult, search, search_stack,
+                  enable_profiling, profile_op, profile_stage)
 
 
 def format_output(result):
@@ -45,13 +55,24 @@ def format_output(result):
     return "\n".join(output)
 
 
-if __name__ == "__main__":
+def print_json(result):
+    """Print a result dict as JSON"""
+    import json
+    print(json.dumps(result, indent=2, ensure_ascii=False, default=SearchResult.to_dict))
+
+
+def build_parser():
+    """Build the CLI argument parser"""
+    import argparse
+
     parser = argparse.ArgumentParser(description="UI Pro Max Search")
     parser.add_argument("query", help="Search query")
     parser.add_argument("--domain", "-d", choices=list(CSV_CONFIG.keys()), help="Search domain")
-    parser.add_argument("--stack", "-s", choices=AVAILABLE_STACKS, help="Stack-specific search (html-tailwind, react, nextjs)")
+    parser.add_argument("--stack", "-s", help=f"Stack-specific search: one stack, a comma-separated list, or 'all' ({', '.join(AVAILABLE_STACKS)})")
     parser.add_argument("--max-results", "-n", type=int, default=MAX_RESULTS, help="Max results (default: 3)")
     parser.add_argument("--json", action="store_true", help="Output as JSON")
+    parser.add_argument("--fuzzy", action="store_true", help="Match prefixes, typos and inflections (e.g. glassmorph, dashboards)")
+    parser.add_argument("--profile", action="store_true", help="Emit per-stage timings and counts as JSON lines on stderr (or set UIPRO_PROFILE)")
     # Design system generation
     parser.add_argument("--design-system", "-ds", action="store_true", help="Generate complete design system recommendation")
     parser.add_argument("--project-name", "-p", type=str, default=None, help="Project name for design system output")
@@ -60,47 +81,62 @@ if __name__ == "__main__":
     parser.add_argument("--persist", action="store_true", help="Save design system to design-system/MASTER.md (creates hierarchical structure)")
     parser.add_argument("--page", type=str, default=None, help="Create page-specific override file in design-system/pages/")
     parser.add_argument("--output-dir", "-o", type=str, default=None, help="Output directory for persisted files (default: current directory)")
+    return parser
+
+
+def run_design_system(args):
+    """Generate (and optionally persist) a design system"""
+    from design_system import generate_design_system
+
+    result = generate_design_system(
+        args.query,
+        args.project_name,
+        args.format,
+        persist=args.persist,
+        page=args.page,
+        output_dir=args.output_dir
+    )
+    print(result)
 
-    args = parser.parse_args()
+    # Print persistence confirmation
+    if args.persist:
+        project_slug = args.project_name.lower().replace(' ', '-') if args.project_name else "default"
+        print("\n" + "=" * 60)
+        print(f"✅ Design system persisted to design-system/{project_slug}/")
+        print(f"   📄 design-system/{project_slug}/MASTER.md (Global Source of Truth)")
+        if args.page:
+            page_filename = args.page.lower().replace(' ', '-')
+            print(f"   📄 design-system/{project_slug}/pages/{page_filename}.md (Page Overrides)")
+        print("")
+        print(f"📖 Usage: When building a page, check design-system/{project_slug}/pages/[page].md first.")
+        print(f"   If exists, its rules override MASTER.md. Otherwise, use MASTER.md.")
+        print("=" * 60)
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.profile:
+        enable_profiling()
 
     # Design system takes priority
     if args.design_system:
-        result = generate_design_system(
-            args.query, 
-            args.project_name, 
-            args.format,
-            persist=args.persist,
-            page=args.page,
-            output_dir=args.output_dir
-        )
-        print(result)
-        
-        # Print persistence confirmation
-        if args.persist:
-            project_slug = args.project_name.lower().replace(' ', '-') if args.project_name else "default"
-            print("\n" + "=" * 60)
-            print(f"✅ Design system persisted to design-system/{project_slug}/")
-            print(f"   📄 design-system/{project_slug}/MASTER.md (Global Source of Truth)")
-            if args.page:
-                page_filename = args.page.lower().replace(' ', '-')
-                print(f"   📄 design-system/{project_slug}/pages/{page_filename}.md (Page Overrides)")
-            print("")
-            print(f"📖 Usage: When building a page, check design-system/{project_slug}/pages/[page].md first.")
-            print(f"   If exists, its rules override MASTER.md. Otherwise, use MASTER.md.")
-            print("=" * 60)
-    # Stack search
-    elif args.stack:
-        result = search_stack(args.query, args.stack, args.max_results)
-        if args.json:
-            import json
-            print(json.dumps(result, indent=2, ensure_ascii=False))
-        else:
-            print(format_output(result))
-    # Domain search
-    else:
-        result = search(args.query, args.domain, args.max_results)
-        if args.json:
-            import json
-            print(json.dumps(result, indent=2, ensure_ascii=False))
+        with profile_op("cli", mode="design-system"):
+            run_design_system(args)
+        return
+
+    # Stack search, otherwise domain search
+    with profile_op("cli", mode="stack" if args.stack else "domain"):
+        if args.stack:
+            result = search_stack(args.query, args.stack, args.max_results, args.fuzzy)
         else:
-            print(format_output(result))
+            result = search(args.query, args.domain, args.max_results, args.fuzzy)
+
+        with profile_stage("format"):
+            if args.json:
+                print_json(result)
+            else:
+                print(format_output(result))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
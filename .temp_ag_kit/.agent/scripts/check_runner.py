@@ -0,0 +1,513 @@
+#!/usr/bin/env python3
+"""
+Check Runner - Antigravity Kit
+==============================
+
+Shared execution engine for checklist.py and verify_all.py.
+Runs validation checks as a dependency graph on a worker pool.
+
+A check is a dict in priority order:
+    {"name": str, "required": bool, "depends_on": [names],
+     "resource": "cpu" | "io" | "browser" | "network", "estimate": seconds, ...}
+
+"resource" and "estimate" are optional. Anything else in the dict (script
+path, category, url) is passed through to the execute callable untouched.
+
+Resource classes:
+    cpu      - CPU-bound scans (regex audits, linters, test suites)
+    io       - file-reading scans that mostly wait on disk
+    browser  - Lighthouse / Playwright; heavy and timing-sensitive
+    network  - registry/advisory lookups (npm audit)
+
+Plugin interface:
+    A skill script that defines
+
+        def run(project_path, context: dict = None) -> dict
+
+    can be imported and called in-process instead of being launched as
+    `python <script> <project>`. run() must not print or exit; it returns a
+    JSON-serializable report with a boolean "passed" (the same verdict the
+    script's exit code gives). context is shared by every check in a run
+    and carries orchestrator options such as "url", plus "index", a
+    project_index.ProjectIndex that replaces per-script tree walks and file
+    reads. File-local checks may also get "memo", a verify_cache.FileMemo
+    for per-file results. Scripts without run() still go through the
+    subprocess path.
+
+Event protocol:
+    Checks may report as they go instead of only at the end. An event is a
+    JSON object with an "event" key:
+
+        {"event": "progress", "done": 2, "total": 4, "message": "secrets"}
+        {"event": "finding", "severity": "critical", "message": ..., "file": ...}
+        {"event": "metric", "name": "scanned_files", "value": 1234}
+        {"event": "done", "passed": true}
+
+    In-process plugins call context["emit"](event). Subprocess checks are
+    started with AG_KIT_EVENTS=1 and print events as single JSON lines on
+    stdout; other stdout lines are ordinary output. An EventLog aggregates a
+    check's events (exact counts per severity, the first MAX_FINDINGS
+    findings) and forwards them to a listener, e.g. a ProgressBoard. Only
+    the last OUTPUT_TAIL_LINES lines of a subprocess's output are kept.
+
+Cancellation:
+    Each subprocess check runs in its own process group. A RunControl with
+    cancel_running set (--fail-fast) kills the groups of all other running
+    checks as soon as one check stops the run, and in-process plugins are
+    interrupted at their next emit(). Cancelled checks are reported as
+    skipped.
+"""
+
+import importlib.util
+import json
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Default concurrency per resource class
+RESOURCE_LIMITS = {
+    "cpu": os.cpu_count() or 1,
+    "io": 4,
+    "browser": 1,
+    "network": 2,
+}
+
+
+EVENT_TYPES = ("finding", "progress", "metric", "done")
+
+SEVERITY_ORDER = ("critical", "high", "medium", "low", "info")
+
+# Findings kept per check; the rest are only counted
+MAX_FINDINGS = 50
+
+# Lines of subprocess stdout / stderr kept per check
+OUTPUT_TAIL_LINES = 200
+
+# Seconds between SIGTERM and SIGKILL when stopping a check's process group
+KILL_GRACE = 2
+
+
+# Imported skill scripts by path (None = no usable run())
+_PLUGINS = {}
+
+
+def load_plugin(script_path) -> Optional[object]:
+    """
+    Import a skill script as a module and return it if it exposes run().
+    Call from the main thread: some scripts reconfigure stdout on import.
+    """
+    key = str(script_path)
+    if key not in _PLUGINS:
+        module_name = f"_agent_check_{os.path.splitext(os.path.basename(key))[0]}"
+        try:
+            spec = importlib.util.spec_from_file_location(module_name, key)
+            module = importlib.util.module_from_spec(spec)
+            sys.modules[module_name] = module
+            spec.loader.exec_module(module)
+        except (Exception, SystemExit):
+            sys.modules.pop(module_name, None)
+            module = None
+        _PLUGINS[key] = module if callable(getattr(module, "run", None)) else None
+    return _PLUGINS[key]
+
+
+class CheckCancelled(Exception):
+    """Raised inside an in-process check that another check's failure cancelled"""
+
+
+def cancelled_result(name: str, control: "RunControl", duration: float) -> dict:
+    return {"name": name, "passed": True, "skipped": True, "cancelled": True, "output": "",
+            "error": f"Cancelled: {control.stopped_by} {control.reason}", "duration": duration}
+
+
+def run_plugin(module, name: str, project_path: str, context: dict,
+               control: Optional["RunControl"] = None) -> dict:
+    """
+    Call a plugin's run() and wrap its report as a check result.
+    With a control, the plugin is cancelled at its next emit() once the run
+    is stopped by another check.
+    """
+    start = time.monotonic()
+    if control and context.get("emit"):
+        emit = context["emit"]
+
+        def checked_emit(event: dict):
+            if control.cancelled(name):
+                raise CheckCancelled(name)
+            emit(event)
+
+        context = dict(context, emit=checked_emit)
+    try:
+        report = module.run(project_path, context)
+    except CheckCancelled:
+        return cancelled_result(name, control, time.monotonic() - start)
+    except Exception as e:
+        return {"name": name, "passed": False, "output": "", "error": f"{type(e).__name__}: {e}",
+                "exception": True, "skipped": False, "duration": time.monotonic() - start}
+    if context.get("emit"):
+        context["emit"]({"event": "done", "passed": bool(report.get("passed", False))})
+    return {
+        "name": name,
+        "passed": bool(report.get("passed", False)),
+        "output": json.dumps(report, indent=2, default=str),
+        "error": str(report.get("error", "")),
+        "report": report,
+        "skipped": False,
+        "duration": time.monotonic() - start
+    }
+
+
+def parse_event(line: str) -> Optional[dict]:
+    """The event on a line of check output, or None for ordinary output"""
+    line = line.strip()
+    if not (line.startswith("{") and line.endswith("}")):
+        return None
+    try:
+        event = json.loads(line)
+    except ValueError:
+        return None
+    if isinstance(event, dict) and event.get("event") in EVENT_TYPES:
+        return event
+    return None
+
+
+class EventLog:
+    """
+    Collects one check's events; callable, so it can be passed as emit.
+    listener(check name, event) sees every event as it arrives.
+    """
+
+    def __init__(self, name: str, listener: Optional[Callable[[str, dict], None]] = None):
+        self.name = name
+        self.listener = listener
+        self.findings = []
+        self.severity_counts = Counter()
+        self.metrics = {}
+        self.progress = None
+        self.done = None
+
+    def __call__(self, event: dict):
+        kind = event.get("event")
+        if kind == "finding":
+            self.severity_counts[event.get("severity", "info")] += 1
+            if len(self.findings) < MAX_FINDINGS:
+                self.findings.append(event)
+        elif kind == "progress":
+            self.progress = event
+        elif kind == "metric":
+            self.metrics[event.get("name")] = event.get("value")
+        elif kind == "done":
+            self.done = event
+        else:
+            return
+        if self.listener:
+            self.listener(self.name, event)
+
+    def summary(self) -> dict:
+        """Fields to merge into the check's result"""
+        summary = {}
+        if self.severity_counts:
+            summary["severity_counts"] = dict(self.severity_counts)
+            summary["findings"] = self.findings
+        if self.metrics:
+            summary["metrics"] = self.metrics
+        return summary
+
+
+def format_severity_counts(counts: Dict[str, int]) -> str:
+    """'2 critical, 5 high', most severe first"""
+    rank = {severity: i for i, severity in enumerate(SEVERITY_ORDER)}
+    ordered = sorted(counts, key=lambda s: rank.get(s, len(rank)))
+    return ", ".join(f"{counts[s]} {s}" for s in ordered)
+
+
+def kill_process_group(proc: subprocess.Popen):
+    """Stop a check and everything it started (linters, browsers, npm)"""
+    if os.name != "posix":
+        proc.kill()
+        return
+
+    def send(sig):
+        try:
+            os.killpg(proc.pid, sig)
+        except OSError:
+            pass  # already gone
+
+    send(signal.SIGTERM)
+    # The group can outlive its leader, so escalate regardless of proc's own state
+    killer = threading.Timer(KILL_GRACE, send, args=(signal.SIGKILL,))
+    killer.daemon = True
+    killer.start()
+
+
+def run_subprocess(cmd: List[str], timeout: float, events: Optional[Callable[[dict], None]] = None,
+                   control: Optional["RunControl"] = None, name: Optional[str] = None) -> dict:
+    """
+    Run a check script in its own process group, handing event lines to
+    events() as they are printed. Returns {"returncode", "output", "error",
+    "timeout", "cancelled"}; output and error hold only the last
+    OUTPUT_TAIL_LINES lines of stdout and stderr. The whole group is killed
+    on timeout, or by control when another check stops the run.
+    """
+    group = {"start_new_session": True} if os.name == "posix" else \
+        {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                            text=True, encoding="utf-8", errors="replace",
+                            env=dict(os.environ, AG_KIT_EVENTS="1"), **group)
+    if control:
+        control.attach(name, proc)
+    stdout_tail = deque(maxlen=OUTPUT_TAIL_LINES)
+    stderr_tail = deque(maxlen=OUTPUT_TAIL_LINES)
+    # Drain stderr alongside stdout so neither pipe can fill up and block the script
+    stderr_reader = threading.Thread(target=stderr_tail.extend, args=(proc.stderr,), daemon=True)
+    stderr_reader.start()
+    timed_out = threading.Event()
+
+    def kill():
+        timed_out.set()
+        kill_process_group(proc)
+
+    timer = threading.Timer(timeout, kill)
+    timer.start()
+    try:
+        for line in proc.stdout:
+            event = parse_event(line) if events else None
+            if event is not None:
+                events(event)
+            else:
+                stdout_tail.append(line)
+        proc.wait()
+    finally:
+        timer.cancel()
+        if control:
+            control.detach(name)
+        stderr_reader.join()
+        proc.stdout.close()
+        proc.stderr.close()
+    return {"returncode": proc.returncode, "output": "".join(stdout_tail),
+            "error": "".join(stderr_tail), "timeout": timed_out.is_set(),
+            "cancelled": bool(control and control.cancelled(name)) and proc.returncode != 0}
+
+
+class ProgressBoard:
+    """
+    One live status line on stderr with the latest progress of each running
+    check. Only drawn on a terminal; call clear() before printing results.
+    """
+
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stderr
+        self.enabled = self.stream.isatty()
+        self._status = {}
+        self._lock = threading.Lock()
+
+    def update(self, name: str, event: dict):
+        if not self.enabled or event.get("event") not in ("progress", "done"):
+            return
+        with self._lock:
+            if event["event"] == "done":
+                self._status.pop(name, None)
+            else:
+                step = f"{event['done']}/{event['total']}" if event.get("total") else ""
+                self._status[name] = " ".join(filter(None, [step, event.get("message", "")]))
+            self._draw()
+
+    def finish(self, name: str):
+        """Drop a check that has returned its result"""
+        self.update(name, {"event": "done"})
+
+    def clear(self):
+        if self.enabled:
+            with self._lock:
+                self.stream.write("\r\033[K")
+                self.stream.flush()
+
+    def _draw(self):
+        width = shutil.get_terminal_size().columns - 1
+        line = " | ".join(f"{name}: {status}" for name, status in self._status.items())
+        self.stream.write("\r\033[K" + line[:width])
+        self.stream.flush()
+
+
+class RunControl:
+    """
+    Lets a check stop the run while it is still going (see run_checks).
+    With cancel_running, stopping also kills every other running check.
+    """
+
+    def __init__(self, cancel_running: bool = False):
+        self.cancel_running = cancel_running
+        self.stopped_by = None
+        self.reason = None
+        self._stop = threading.Event()
+        self._procs = {}  # check name -> running subprocess
+        self._lock = threading.Lock()
+
+    def stop(self, name: str, reason: str = "failed"):
+        with self._lock:
+            if self._stop.is_set():
+                return
+            self.stopped_by, self.reason = name, reason
+            self._stop.set()
+            victims = [proc for check, proc in self._procs.items() if check != name] \
+                if self.cancel_running else []
+        for proc in victims:
+            kill_process_group(proc)
+
+    def stopped(self) -> bool:
+        return self._stop.is_set()
+
+    def cancelled(self, name: str) -> bool:
+        """Whether the check should give up: another check stopped a --fail-fast run"""
+        return self.cancel_running and self._stop.is_set() and self.stopped_by != name
+
+    def attach(self, name: str, proc: subprocess.Popen):
+        with self._lock:
+            self._procs[name] = proc
+            late = self.cancelled(name)
+        if late:
+            kill_process_group(proc)
+
+    def detach(self, name: str):
+        with self._lock:
+            self._procs.pop(name, None)
+
+
+def is_failure(result: dict) -> bool:
+    """A result counts as failed only if it ran and did not pass"""
+    return not result["passed"] and not result.get("skipped")
+
+
+def _dependency_state(check: dict, results: list, index: dict) -> Tuple[str, Optional[str]]:
+    """
+    Return ("ready" | "wait" | "blocked", blocking dependency name).
+    Dependencies that are not part of this run are treated as satisfied.
+    """
+    for dep in check.get("depends_on", []):
+        if dep not in index:
+            continue
+        dep_result = results[index[dep]]
+        if dep_result is None:
+            return "wait", dep
+        if is_failure(dep_result) or dep_result.get("blocked"):
+            return "blocked", dep
+    return "ready", None
+
+
+def run_checks(checks: List[dict],
+               execute: Callable[[dict], dict],
+               jobs: int = 1,
+               on_result: Optional[Callable[[dict], None]] = None,
+               limits: Optional[Dict[str, int]] = None,
+               fail_fast: bool = True,
+               control: Optional[RunControl] = None) -> Tuple[List[dict], Optional[str]]:
+    """
+    Run checks concurrently, respecting dependencies and priority.
+
+    execute(check) must return a result dict with "name", "passed" and
+    "skipped"; it runs on a worker thread and must not print.
+    on_result(result) is called on the calling thread, strictly in priority
+    order, as soon as a result and every higher-priority result are known.
+
+    At most `jobs` checks run at once, and at most limits[resource] of each
+    resource class. Checks start longest-estimate first (ties in priority
+    order) so long browser runs overlap with everything else.
+
+    With fail_fast, a failing required check stops the run: checks not yet
+    started are dropped, checks already running finish and are reported.
+    Checks whose dependencies failed are reported as skipped.
+    control.stop(name), e.g. from an event listener, stops the run the same
+    way without waiting for that check to finish. A required failure is also
+    passed on to control, which may cancel the checks still running.
+
+    Results get "start" and "end": seconds from the start of the run.
+
+    Returns (results in priority order, name of the check that stopped the
+    run or None).
+    """
+    index = {check["name"]: i for i, check in enumerate(checks)}
+    results = [None] * len(checks)
+    pending = sorted(range(len(checks)), key=lambda i: -checks[i].get("estimate", 0))
+    running = {}
+    active = Counter()
+    limits = limits or {}
+    stopped_by = None
+    next_report = 0
+    jobs = max(1, jobs)
+    t0 = time.monotonic()
+
+    def timed(check: dict) -> dict:
+        start = time.monotonic() - t0
+        result = execute(check)
+        return dict(result, start=start, end=time.monotonic() - t0)
+
+    def report_ready():
+        nonlocal next_report
+        while next_report < len(checks) and results[next_report] is not None:
+            if on_result:
+                on_result(results[next_report])
+            next_report += 1
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        while pending or running:
+            if control and control.stopped() and not stopped_by:
+                stopped_by = control.stopped_by
+            # Start every ready check the pool has room for, in priority order
+            for i in list(pending):
+                if stopped_by or len(running) >= jobs:
+                    break
+                resource = checks[i].get("resource")
+                if resource in limits and active[resource] >= limits[resource]:
+                    continue
+                state, dep = _dependency_state(checks[i], results, index)
+                if state == "wait":
+                    continue
+                pending.remove(i)
+                if state == "blocked":
+                    results[i] = {"name": checks[i]["name"], "passed": True, "skipped": True,
+                                  "blocked": True, "error": f"Dependency failed: {dep}"}
+                    continue
+                running[pool.submit(timed, checks[i])] = i
+                active[resource] += 1
+
+            if stopped_by:
+                pending = []
+
+            if not running:
+                # Nothing in flight but checks left: their dependencies can never resolve
+                for i in pending:
+                    results[i] = {"name": checks[i]["name"], "passed": True, "skipped": True,
+                                  "blocked": True, "error": "Unresolvable dependencies"}
+                pending = []
+                report_ready()
+                continue
+
+            # With a control, wake up regularly to notice a stop between completions
+            done, _ = wait(running, timeout=0.1 if control and not stopped_by else None,
+                           return_when=FIRST_COMPLETED)
+            for future in done:
+                i = running.pop(future)
+                active[checks[i].get("resource")] -= 1
+                try:
+                    results[i] = future.result()
+                except Exception as e:
+                    results[i] = {"name": checks[i]["name"], "passed": False, "skipped": False, "error": str(e)}
+                if fail_fast and checks[i].get("required") and is_failure(results[i]) and not stopped_by:
+                    stopped_by = checks[i]["name"]
+                    if control:
+                        control.stop(stopped_by)
+            report_ready()
+
+    # After a fail-fast stop, dropped checks leave gaps; report what did run
+    if on_result:
+        for result in results[next_report:]:
+            if result is not None:
+                on_result(result)
+    return [r for r in results if r is not None], stopped_by
@@ -9,6 +9,13 @@ Use this for incremental validation during development.
 Usage:
     python scripts/checklist.py .                    # Run core checks
     python scripts/checklist.py . --url <URL>        # Include performance checks
+    python scripts/checklist.py . --jobs 1           # Run checks one at a time
+    python scripts/checklist.py . --isolate          # One subprocess per check
+    python scripts/checklist.py . --no-cache         # Ignore results from earlier runs
+    python scripts/checklist.py . --stop-on-critical # Stop at a required check's critical finding
+    python scripts/checklist.py . --fail-fast        # Also kill checks still running when stopping
+    python scripts/checklist.py . --report timings   # Trends, p95, critical path of past runs
+    python scripts/checklist.py . --watch            # Re-run affected checks on every edit
 
 Priority Order:
     P0: Security Scan (vulnerabilities, secrets)
@@ -18,14 +25,43 @@ Priority Order:
     P4: UX Audit (psychology laws, accessibility)
     P5: SEO Check (meta tags, structure)
     P6: Performance (lighthouse - requires URL)
+
+Independent checks run concurrently (--jobs); results are still reported
+in priority order, and a failed required check stops the run. With
+--fail-fast, checks already running are killed too. Each subprocess check's
+time budget comes from its durations in earlier runs (see run_history),
+which also decide start order (slowest first); --report timings shows them.
+
+Skill scripts that expose run() (see check_runner) are called in-process;
+the rest, or all of them with --isolate, run as subprocesses.
+
+Core check results are cached between runs (see verify_cache): a check whose
+script and project files are unchanged is not run again, and file-local
+audits only re-scan files that changed.
+
+With --watch the process stays up (see file_watcher): after each burst of
+edits settles it re-runs only the checks whose inputs changed (CHECK_INPUTS),
+with plugins, the project index and the cache still warm.
+
+Checks stream progress and findings as events (see check_runner): a status
+line shows what is running, and each result lists its finding counts.
 """
 
+import os
 import sys
-import subprocess
+import time
 import argparse
 from pathlib import Path
 from typing import List, Tuple, Optional
 
+from check_runner import (EventLog, ProgressBoard, RunControl, cancelled_result,
+                          format_severity_counts, is_failure, load_plugin, run_checks,
+                          run_plugin, run_subprocess)
+from file_watcher import open_watcher
+from project_index import ProjectIndex
+from run_history import RunHistory
+from verify_cache import VerifyCache
+
 # ANSI colors for terminal output
 class Colors:
     HEADER = '\033[95m'
@@ -69,22 +105,40 @@ PERFORMANCE_CHECKS = [
     ("Playwright E2E", ".agent/skills/webapp-testing/scripts/playwright_runner.py", False),
 ]
 
+# Checks that only make sense once others passed (name -> prerequisite names).
+# Anything not listed is independent and may run concurrently.
+CHECK_DEPENDENCIES = {
+    "Test Runner": ["Lint Check"],  # don't run the suite on code that fails lint/type-check
+}
+
+# File suffixes each check reads, for --watch; a change to other files can't
+# alter its result. Unlisted checks depend on the whole project.
+CHECK_INPUTS = {
+    "Schema Validation": {".prisma", ".ts"},
+    "UX Audit": {".tsx", ".jsx", ".html", ".vue", ".svelte", ".css"},
+    "SEO Check": {".html", ".htm", ".jsx", ".tsx"},
+}
+
+DEFAULT_JOBS = min(4, os.cpu_count() or 1)
+
 def check_script_exists(script_path: Path) -> bool:
     """Check if script file exists"""
     return script_path.exists() and script_path.is_file()
 
-def run_script(name: str, script_path: Path, project_path: str, url: Optional[str] = None) -> dict:
+def run_script(name: str, script_path: Path, project_path: str, url: Optional[str] = None,
+               events: Optional[EventLog] = None, timeout: float = 300,
+               control: Optional[RunControl] = None) -> dict:
     """
-    Run a validation script and capture results
+    Run a validation script and collect results.
+    Runs on a worker thread, so it does not print; see print_result().
+    Event lines the script prints go to events as they arrive; the script
+    is killed after timeout seconds, or when control cancels the run.
     
     Returns:
-        dict with keys: name, passed, output, skipped
+        dict with keys: name, passed, output, error, skipped, duration
     """
     if not check_script_exists(script_path):
-        print_warning(f"{name}: Script not found, skipping")
-        return {"name": name, "passed": True, "output": "", "skipped": True}
-    
-    print_step(f"Running: {name}")
+        return {"name": name, "passed": True, "output": "", "skipped": True, "error": "Script not found"}
     
     # Build command
     cmd = ["python", str(script_path), project_path]
@@ -92,38 +146,53 @@ def run_script(name: str, script_path: Path, project_path: str, url: Optional[st
         cmd.append(url)
     
     # Run script
+    start = time.monotonic()
     try:
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=300  # 5 minute timeout
-        )
+        result = run_subprocess(cmd, timeout, events, control, name)
         
-        passed = result.returncode == 0
+        if result["timeout"]:
+            return {"name": name, "passed": False, "output": "", "error": "Timeout", "timeout": True,
+                    "budget": timeout, "skipped": False, "duration": time.monotonic() - start}
         
-        if passed:
-            print_success(f"{name}: PASSED")
-        else:
-            print_error(f"{name}: FAILED")
-            if result.stderr:
-                print(f"  Error: {result.stderr[:200]}")
+        if result["cancelled"]:
+            return cancelled_result(name, control, time.monotonic() - start)
         
         return {
             "name": name,
-            "passed": passed,
-            "output": result.stdout,
-            "error": result.stderr,
-            "skipped": False
+            "passed": result["returncode"] == 0,
+            "output": result["output"],
+            "error": result["error"],
+            "skipped": False,
+            "duration": time.monotonic() - start
         }
     
-    except subprocess.TimeoutExpired:
-        print_error(f"{name}: TIMEOUT (>5 minutes)")
-        return {"name": name, "passed": False, "output": "", "error": "Timeout", "skipped": False}
-    
     except Exception as e:
-        print_error(f"{name}: ERROR - {str(e)}")
-        return {"name": name, "passed": False, "output": "", "error": str(e), "skipped": False}
+        return {"name": name, "passed": False, "output": "", "error": str(e), "exception": True,
+                "skipped": False, "duration": time.monotonic() - start}
+
+def _timing(result: dict) -> str:
+    return "cached" if result.get("cached") else f"{result['duration']:.1f}s"
+
+def print_result(result: dict):
+    """Print one check result (called in priority order)"""
+    name = result["name"]
+    if result.get("skipped"):
+        if result.get("blocked") or result.get("cancelled"):
+            print_warning(f"{name}: {result['error']}, skipping")
+        else:
+            print_warning(f"{name}: Script not found, skipping")
+    elif result.get("timeout"):
+        print_error(f"{name}: TIMEOUT (>{result['budget']:.0f}s)")
+    elif result.get("exception"):
+        print_error(f"{name}: ERROR - {result['error']}")
+    elif result["passed"]:
+        print_success(f"{name}: PASSED ({_timing(result)})")
+    else:
+        print_error(f"{name}: FAILED ({_timing(result)})")
+        if result.get("error"):
+            print(f"  Error: {result['error'][:200]}")
+    if result.get("severity_counts"):
+        print(f"  Findings: {format_severity_counts(result['severity_counts'])}")
 
 def print_summary(results: List[dict]):
     """Print final summary report"""
@@ -167,11 +236,25 @@ def main():
 Examples:
   python scripts/checklist.py .                      # Core checks only
   python scripts/checklist.py . --url http://localhost:3000  # Include performance
+  python scripts/checklist.py . --jobs 1                    # Sequential
+  python scripts/checklist.py . --isolate                   # Subprocess per check
+  python scripts/checklist.py . --no-cache                  # Re-run everything
+  python scripts/checklist.py . --stop-on-critical          # Stop at first critical finding
+  python scripts/checklist.py . --fail-fast                 # Kill running checks on stop
+  python scripts/checklist.py . --report timings            # Durations across runs
+  python scripts/checklist.py . --watch                     # Re-check on every save
         """
     )
     parser.add_argument("project", help="Project path to validate")
     parser.add_argument("--url", help="URL for performance checks (lighthouse, playwright)")
     parser.add_argument("--skip-performance", action="store_true", help="Skip performance checks even if URL provided")
+    parser.add_argument("--jobs", "-j", type=int, default=DEFAULT_JOBS, help=f"Checks to run in parallel (default: {DEFAULT_JOBS}, 1 = sequential)")
+    parser.add_argument("--isolate", action="store_true", help="Run every check in its own Python subprocess (enforces timeouts)")
+    parser.add_argument("--no-cache", action="store_true", help="Don't reuse or save results from earlier runs")
+    parser.add_argument("--stop-on-critical", action="store_true", help="Stop as soon as a required check reports a critical finding")
+    parser.add_argument("--watch", action="store_true", help="Keep running and re-check on every change to the project")
+    parser.add_argument("--report", choices=["timings"], help="Show check timings from earlier runs (trend, p95, critical path) and exit")
+    parser.add_argument("--fail-fast", action="store_true", help="When a required check stops the run, also kill the checks still running")
     
     args = parser.parse_args()
     
@@ -181,37 +264,169 @@ Examples:
         print_error(f"Project path does not exist: {project_path}")
         sys.exit(1)
     
+    history = RunHistory(project_path)
+    if args.report == "timings":
+        print_header("📈 CHECK TIMINGS")
+        print(f"Project: {project_path}\n")
+        for line in history.report():
+            print(line)
+        sys.exit(0)
+    
     print_header("🚀 ANTIGRAVITY KIT - MASTER CHECKLIST")
     print(f"Project: {project_path}")
     print(f"URL: {args.url if args.url else 'Not provided (performance checks skipped)'}")
     
-    results = []
+    checks = [
+        {"name": name, "script": project_path / script_path, "required": required,
+         "depends_on": CHECK_DEPENDENCIES.get(name, []), "category": "core",
+         "estimate": history.estimate(name, 0)}
+        for name, script_path, required in CORE_CHECKS
+    ]
+    
+    # Performance checks join the same run; their failures never stop it
+    if args.url and not args.skip_performance:
+        checks += [
+            {"name": name, "script": project_path / script_path, "required": False,
+             "depends_on": CHECK_DEPENDENCIES.get(name, []), "category": "performance", "url": args.url,
+             "estimate": history.estimate(name, 0)}
+            for name, script_path, _ in PERFORMANCE_CHECKS
+        ]
     
-    # Run core checks
-    print_header("📋 CORE CHECKS")
-    for name, script_path, required in CORE_CHECKS:
-        script = project_path / script_path
-        result = run_script(name, script, str(project_path))
-        results.append(result)
+    # Import in-process plugins up front, on this thread
+    plugins = {} if args.isolate else {
+        check["name"]: load_plugin(check["script"])
+        for check in checks if check_script_exists(check["script"])
+    }
+    # One shared walk of the project for every in-process check
+    context = {"project": str(project_path), "url": args.url, "index": ProjectIndex(project_path)}
+    cache = None if args.no_cache else VerifyCache(project_path, context["index"])
+    board = ProgressBoard()
+    control = None  # one per round, see run_round()
+    
+    def is_critical(check: dict, counts: dict) -> bool:
+        return bool(args.stop_on_critical and check["required"] and counts.get("critical"))
+    
+    def execute(check: dict) -> dict:
+        def listener(name: str, event: dict):
+            board.update(name, event)
+            if event["event"] == "finding" and is_critical(check, {event.get("severity"): 1}):
+                control.stop(name, "reported a critical finding")
         
-        # If required check fails, stop
-        if required and not result["passed"] and not result.get("skipped"):
-            print_error(f"CRITICAL: {name} failed. Stopping checklist.")
-            print_summary(results)
-            sys.exit(1)
+        # Performance checks measure a live URL; only core checks are cached
+        key = cache.check_key(check) if cache and check["category"] == "core" else None
+        result = cache.lookup(check, key) if key else None
+        if not result:
+            events = EventLog(check["name"], listener)
+            if plugins.get(check["name"]):
+                check_context = dict(context, emit=events)
+                if key:
+                    check_context["memo"] = cache.memo(check["name"], key)
+                result = run_plugin(plugins[check["name"]], check["name"], str(project_path), check_context, control)
+            else:
+                result = run_script(check["name"], check["script"], str(project_path), check.get("url"),
+                                    events, history.budget(check["name"], 300), control)
+            result.update(events.summary())
+            if key:
+                cache.store(check, key, result)
+        board.finish(check["name"])
+        # A cached result replays no events; stop on its recorded counts
+        if is_critical(check, result.get("severity_counts", {})):
+            control.stop(check["name"], "reported a critical finding")
+        return result
     
-    # Run performance checks if URL provided
-    if args.url and not args.skip_performance:
-        print_header("⚡ PERFORMANCE CHECKS")
-        for name, script_path, required in PERFORMANCE_CHECKS:
-            script = project_path / script_path
-            result = run_script(name, script, str(project_path), args.url)
-            results.append(result)
+    categories = {check["name"]: check["category"] for check in checks}
+    
+    def run_round(selected: List[dict]) -> Tuple[List[dict], Optional[str]]:
+        nonlocal control
+        control = RunControl(cancel_running=args.fail_fast)
+        print_header("📋 CORE CHECKS")
+        print_step(f"Running {len(selected)} checks ({args.jobs} parallel)")
+        headers_shown = {"core"}
+        
+        def report(result: dict):
+            board.clear()
+            if categories[result["name"]] not in headers_shown:
+                headers_shown.add(categories[result["name"]])
+                print_header("⚡ PERFORMANCE CHECKS")
+            print_result(result)
+        
+        results, stopped_by = run_checks(
+            selected,
+            execute,
+            jobs=args.jobs,
+            on_result=report,
+            control=control
+        )
+        
+        if cache:
+            cache.save()
+        history.record(results, files=sum(len(names) for _, names in context["index"].walk()))
+        
+        # If a required check failed, the remaining checks were not started
+        if stopped_by:
+            then = "Skipping the rest of this round." if args.watch else "Stopping checklist."
+            print_error(f"CRITICAL: {stopped_by} {control.reason}. {then}")
+        return results, stopped_by
+    
+    results, stopped_by = run_round(checks)
+    
+    if args.watch:
+        watch(checks, results, run_round, context, cache, project_path)
+    
+    if stopped_by:
+        print_summary(results)
+        sys.exit(1)
     
     # Print summary
     all_passed = print_summary(results)
     
     sys.exit(0 if all_passed else 1)
 
+def affected(check: dict, changed: Optional[set]) -> bool:
+    """Whether a batch of changed paths (None = unknown) can change the check's result"""
+    if changed is None:
+        return True
+    inputs = CHECK_INPUTS.get(check["name"])
+    return any(inputs is None or Path(path).suffix in inputs or path == str(check["script"])
+               for path in changed)
+
+def watch(checks: List[dict], results: List[dict], run_round, context: dict, cache, project_path: Path):
+    """
+    Re-run the checks affected by each settled batch of edits until Ctrl+C.
+    Plugins, the project index and the cache stay loaded between rounds, so
+    a round only re-reads and re-scans what changed.
+    """
+    latest = {r["name"]: r for r in results}
+    print_summary([latest[c["name"]] for c in checks if c["name"] in latest])
+    watcher = open_watcher(project_path)
+    print_step(f"Watching {project_path} ({watcher.name}), Ctrl+C to stop")
+    by_name = {check["name"]: check for check in checks}
+    try:
+        while True:
+            changed = watcher.changes()
+            names = {check["name"] for check in checks if affected(check, changed)}
+            # A re-run check needs its prerequisites in the same round
+            for check in checks:
+                if check["name"] in names:
+                    names.update(dep for dep in check["depends_on"] if dep in by_name)
+            if not names:
+                continue
+            shown = sorted(os.path.relpath(p, project_path) for p in changed or ())
+            print_step("Changed: " + (", ".join(shown[:5]) + (f" (+{len(shown) - 5} more)" if len(shown) > 5 else "")
+                                      if shown else "unknown (watch queue overflowed)"))
+            context["index"].refresh()
+            if cache:
+                cache.reset()
+            round_results, _ = run_round([check for check in checks if check["name"] in names])
+            latest.update((r["name"], r) for r in round_results)
+            print_summary([latest[c["name"]] for c in checks if c["name"] in latest])
+            print_step("Watching for changes, Ctrl+C to stop")
+    except KeyboardInterrupt:
+        print()
+    finally:
+        watcher.close()
+    failed = any(is_failure(r) for r in latest.values())
+    sys.exit(1 if failed else 0)
+
 if __name__ == "__main__":
     main()
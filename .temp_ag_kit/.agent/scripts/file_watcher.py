@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+File Watcher - Antigravity Kit
+==============================
+
+Waits for edits under a project directory, for checklist.py --watch.
+
+    inotify  - Linux, called through libc (no extra packages)
+    polling  - everywhere else, or when inotify is unavailable / out of
+               watches: compares (size, mtime) snapshots every POLL_INTERVAL
+
+A save is often a burst of events (write, rename, chmod; formatters; a git
+checkout touching hundreds of files). changes() collects them until the tree
+has been quiet for DEBOUNCE seconds and returns the changed paths, or None
+when the watcher lost track (event queue overflow) and everything should be
+treated as changed.
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import time
+from typing import Dict, Optional, Set, Tuple
+
+# Quiet period that ends a burst of changes (seconds)
+DEBOUNCE = 0.3
+
+# Interval between snapshots for the polling watcher (seconds)
+POLL_INTERVAL = 1.0
+
+# Dependencies, VCS data, build output and tool caches; checks writing there must not trigger reruns
+IGNORE_DIRS = {".git", "node_modules", "__pycache__", ".pytest_cache", ".mypy_cache", ".ruff_cache",
+               "dist", "build", ".next", "coverage", "htmlcov", ".nyc_output", ".venv", "venv"}
+
+# Editor swap/backup files and coverage data
+IGNORE_SUFFIXES = ("~", ".swp", ".swx", ".tmp")
+IGNORE_PREFIXES = (".coverage", ".#")
+
+
+def _ignored_file(name: str) -> bool:
+    return name.endswith(IGNORE_SUFFIXES) or name.startswith(IGNORE_PREFIXES)
+
+
+def open_watcher(root, ignore_dirs=IGNORE_DIRS):
+    """The best watcher available here"""
+    try:
+        return InotifyWatcher(root, ignore_dirs)
+    except OSError:
+        return PollingWatcher(root, ignore_dirs)
+
+
+class PollingWatcher:
+    name = "polling"
+
+    def __init__(self, root, ignore_dirs=IGNORE_DIRS):
+        self.root = str(root)
+        self.ignore_dirs = set(ignore_dirs)
+        self._snapshot = self._scan()
+
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        snapshot = {}
+        for dirpath, dirs, files in os.walk(self.root):
+            dirs[:] = [d for d in dirs if d not in self.ignore_dirs]
+            for name in files:
+                if _ignored_file(name):
+                    continue
+                path = os.path.join(dirpath, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                snapshot[path] = (st.st_size, st.st_mtime_ns)
+        return snapshot
+
+    def _diff(self) -> Set[str]:
+        new = self._scan()
+        old, self._snapshot = self._snapshot, new
+        return {path for path in old.keys() | new.keys() if old.get(path) != new.get(path)}
+
+    def changes(self) -> Optional[Set[str]]:
+        """Block until a burst of changes has settled; return the changed paths"""
+        changed = set()
+        while True:
+            time.sleep(DEBOUNCE if changed else POLL_INTERVAL)
+            batch = self._diff()
+            if batch:
+                changed |= batch
+            elif changed:
+                return changed
+
+    def close(self):
+        pass
+
+
+class InotifyWatcher:
+    name = "inotify"
+
+    # From <sys/inotify.h>
+    IN_MODIFY = 0x00000002
+    IN_ATTRIB = 0x00000004
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_DELETE_SELF = 0x00000400
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ISDIR = 0x40000000
+    IN_NONBLOCK = os.O_NONBLOCK
+    IN_CLOEXEC = 0o2000000
+
+    WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+                  | IN_CREATE | IN_DELETE | IN_DELETE_SELF)
+    EVENT = struct.Struct("iIII")  # wd, mask, cookie, len; then the name
+
+    def __init__(self, root, ignore_dirs=IGNORE_DIRS):
+        if not hasattr(select, "poll") or not os.path.exists("/proc/sys/fs/inotify"):
+            raise OSError(errno.ENOSYS, "inotify not available")
+        self.root = str(root)
+        self.ignore_dirs = set(ignore_dirs)
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._fd = self._libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._dirs = {}  # watch descriptor -> directory
+        try:
+            self._watch_tree(self.root)
+        except OSError:
+            self.close()
+            raise  # e.g. ENOSPC: out of watches (fs.inotify.max_user_watches)
+
+    def _watch_tree(self, top: str) -> Set[str]:
+        """Watch top and its subdirectories; return the files already in them"""
+        found = set()
+        for dirpath, dirs, files in os.walk(top):
+            dirs[:] = [d for d in dirs if d not in self.ignore_dirs]
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(dirpath), self.WATCH_MASK)
+            if wd < 0:
+                err = ctypes.get_errno()
+                if err in (errno.ENOENT, errno.EACCES):
+                    continue  # vanished or unreadable; nothing to watch
+                raise OSError(err, f"inotify_add_watch failed for {dirpath}")
+            self._dirs[wd] = dirpath
+            found.update(os.path.join(dirpath, name) for name in files if not _ignored_file(name))
+        return found
+
+    def _read(self, timeout: Optional[float]) -> Optional[Set[str]]:
+        """Paths from the events available within timeout (empty set: none)"""
+        poller = select.poll()
+        poller.register(self._fd, select.POLLIN)
+        if not poller.poll(None if timeout is None else int(timeout * 1000)):
+            return set()
+        changed = set()
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                return changed
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = self.EVENT.unpack_from(data, offset)
+                name = os.fsdecode(data[offset + self.EVENT.size:offset + self.EVENT.size + length].rstrip(b"\0"))
+                offset += self.EVENT.size + length
+                if mask & self.IN_Q_OVERFLOW:
+                    return None
+                if mask & self.IN_IGNORED:
+                    self._dirs.pop(wd, None)
+                    continue
+                dirpath = self._dirs.get(wd)
+                if dirpath is None or not name:
+                    continue
+                path = os.path.join(dirpath, name)
+                if mask & self.IN_ISDIR:
+                    if name in self.ignore_dirs:
+                        continue
+                    if mask & (self.IN_CREATE | self.IN_MOVED_TO):
+                        # A new directory may already hold files by the time it is watched
+                        try:
+                            changed |= self._watch_tree(path)
+                        except OSError:
+                            return None
+                    else:
+                        changed.add(path)  # directory removed or moved away
+                elif not _ignored_file(name):
+                    changed.add(path)
+
+    def changes(self) -> Optional[Set[str]]:
+        """Block until a burst of changes has settled; return the changed paths"""
+        changed = set()
+        while True:
+            batch = self._read(DEBOUNCE if changed else None)
+            if batch is None:
+                return None
+            if batch:
+                changed |= batch
+            elif changed:
+                return changed
+
+    def close(self):
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
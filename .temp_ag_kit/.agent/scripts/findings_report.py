@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Findings Report - Antigravity Kit
+=================================
+
+Machine-readable output for verify_all.py --format json|sarif: one document
+with the findings of every check, deduplicated, plus per-check status and
+timings.
+
+Findings arrive as "finding" events (see check_runner) and are written out
+as they come, so memory holds only their IDs. An ID is a hash of check,
+rule, file, line and message: the same finding keeps its ID across runs,
+which lets CI diff reports. A check that fails without reporting findings
+gets one finding for the failure itself.
+
+json layout:
+    {"tool", "version", "project", "started",
+     "findings": [{"id", "check", "rule", "severity", "message", "file", "line", "column"}],
+     "checks": [{"name", "category", "status", "duration", "cached", "findings"}],
+     "summary": {...}}
+
+sarif: SARIF 2.1.0, one run; check timings go in invocations[0].properties.
+"""
+
+import hashlib
+import json
+import re
+import threading
+from collections import Counter
+from datetime import datetime, timezone
+from typing import List, Optional, TextIO
+
+REPORT_VERSION = 1
+TOOL_NAME = "antigravity-kit"
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+
+# Severity -> SARIF result level
+SARIF_LEVELS = {"critical": "error", "high": "error", "medium": "warning", "low": "note", "info": "note"}
+
+
+def _slug(text: str) -> str:
+    """Rule id from a finding's type or text: counts and details dropped"""
+    text = re.sub(r"\(.*?\)|:.*$", "", str(text))
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-") or "finding"
+
+
+def check_status(result: dict) -> str:
+    if result.get("cancelled"):
+        return "cancelled"
+    if result.get("skipped"):
+        return "skipped"
+    if result.get("timeout"):
+        return "timeout"
+    if result.get("exception"):
+        return "error"
+    return "passed" if result["passed"] else "failed"
+
+
+def normalize(check: str, event: dict) -> dict:
+    """A finding event in the report's common shape"""
+    kind = event.get("rule") or event.get("type") or event.get("pattern") or event.get("issue") or "finding"
+    message = event.get("message") or event.get("issue") or event.get("type") or event.get("pattern") or kind
+    finding = {
+        "check": check,
+        "rule": f"{_slug(check)}/{_slug(kind)}",
+        "severity": event.get("severity", "info"),
+        "message": str(message),
+    }
+    if event.get("file"):
+        finding["file"] = str(event["file"]).replace("\\", "/")
+    for key in ("line", "column"):
+        if event.get(key):
+            finding[key] = int(event[key])
+    ident = "\0".join(str(finding.get(k, "")) for k in ("check", "rule", "file", "line", "message"))
+    finding["id"] = hashlib.sha1(ident.encode("utf-8")).hexdigest()[:16]
+    # Not part of the id: a second copy of the same secret is still the same finding
+    if event.get("count", 1) > 1:
+        finding["message"] += f" ({event['count']} occurrences)"
+    return finding
+
+
+class FindingsReport:
+    def __init__(self, stream: TextIO, fmt: str, project: str):
+        self.stream = stream
+        self.fmt = fmt
+        self.project = project
+        self.started = datetime.now(timezone.utc)
+        self._seen = set()
+        self._rules = {}  # rule id -> first message, for SARIF rule metadata
+        self._per_check = Counter()
+        self._by_severity = Counter()
+        self._lock = threading.Lock()
+        if fmt == "sarif":
+            self._write('{"$schema": %s, "version": "2.1.0", "runs": [{"results": [' % json.dumps(SARIF_SCHEMA))
+        else:
+            head = {"tool": TOOL_NAME, "version": REPORT_VERSION, "project": project,
+                    "started": self.started.isoformat(timespec="seconds")}
+            self._write(json.dumps(head)[:-1] + ', "findings": [')
+
+    def _write(self, text: str):
+        self.stream.write(text)
+
+    def add(self, check: str, event: dict):
+        """Write one finding event (thread-safe); duplicates are dropped"""
+        finding = normalize(check, event)
+        with self._lock:
+            if finding["id"] in self._seen:
+                return
+            self._write(("\n  " if not self._seen else ",\n  ") + json.dumps(self._render(finding)))
+            self._seen.add(finding["id"])
+            self._rules.setdefault(finding["rule"], finding["message"])
+            self._per_check[check] += 1
+            self._by_severity[finding["severity"]] += 1
+
+    def _render(self, finding: dict) -> dict:
+        if self.fmt != "sarif":
+            return finding
+        result = {
+            "ruleId": finding["rule"],
+            "level": SARIF_LEVELS.get(finding["severity"], "warning"),
+            "message": {"text": finding["message"]},
+            "partialFingerprints": {"antigravityKit/v1": finding["id"]},
+            "properties": {"check": finding["check"], "severity": finding["severity"]},
+        }
+        if finding.get("file"):
+            location = {"artifactLocation": {"uri": finding["file"]}}
+            if finding.get("line"):
+                location["region"] = {"startLine": finding["line"]}
+                if finding.get("column"):
+                    location["region"]["startColumn"] = finding["column"]
+            result["locations"] = [{"physicalLocation": location}]
+        return result
+
+    def close(self, results: List[dict], categories: Optional[dict] = None):
+        """Add failures without findings, then per-check timings and the summary"""
+        for r in results:
+            if check_status(r) in ("failed", "timeout", "error") and not self._per_check[r["name"]]:
+                detail = (r.get("error") or "").strip().splitlines()
+                message = f"{r['name']} {check_status(r)}" + (f": {detail[0][:200]}" if detail else "")
+                self.add(r["name"], {"rule": "check-failed", "severity": "high", "message": message})
+        checks = [{"name": r["name"], "category": (categories or {}).get(r["name"], r.get("category")),
+                   "status": check_status(r), "duration": round(r.get("duration", 0), 3),
+                   "cached": bool(r.get("cached")), "findings": self._per_check[r["name"]]}
+                  for r in results]
+        finished = datetime.now(timezone.utc)
+        statuses = Counter(c["status"] for c in checks)
+        summary = {
+            "checks": len(checks),
+            "passed": statuses["passed"],
+            "failed": statuses["failed"] + statuses["timeout"] + statuses["error"],
+            "skipped": statuses["skipped"] + statuses["cancelled"],
+            "findings": len(self._seen),
+            "by_severity": dict(self._by_severity),
+            "duration": round((finished - self.started).total_seconds(), 3),
+        }
+        if self.fmt == "sarif":
+            tool = {"driver": {"name": TOOL_NAME,
+                               "rules": [{"id": rule, "shortDescription": {"text": text[:200]}}
+                                         for rule, text in sorted(self._rules.items())]}}
+            invocation = {"executionSuccessful": summary["failed"] == 0,
+                          "startTimeUtc": self.started.isoformat(timespec="seconds").replace("+00:00", "Z"),
+                          "endTimeUtc": finished.isoformat(timespec="seconds").replace("+00:00", "Z"),
+                          "properties": {"checks": checks, "summary": summary}}
+            self._write('\n], "tool": %s, "invocations": [%s]}]}\n' % (json.dumps(tool), json.dumps(invocation)))
+        else:
+            self._write('\n], "checks": %s, "summary": %s}\n' % (json.dumps(checks), json.dumps(summary)))
+        self.stream.flush()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Project Index - Antigravity Kit
+===============================
+
+One walk of the project tree, shared by every check in a run.
+
+checklist.py and verify_all.py create a ProjectIndex and hand it to
+in-process checks as context["index"]. Checks keep their own skip rules and
+only replace their os.walk / glob calls with index queries:
+
+    index.walk(skip_dirs)      like os.walk(root) with dirs[:] pruning
+    index.files(suffix)        like root.glob("**/*" + suffix), same order
+    index.files(suffix, parent="prisma")      like "**/prisma/*" + suffix
+    index.files(suffix, under="locales")      like "**/locales/**/*" + suffix
+    index.read_text(path)      file contents, read from disk once
+    index.read_bytes(path)     the same, undecoded
+    index.stat(path)           (size, mtime) recorded during the walk
+
+The walk happens on first use and is thread-safe. Directories named in
+PRUNE_DIRS are never indexed; every check skips them anyway. refresh()
+re-walks for the next run of a long-lived process (checklist.py --watch),
+keeping the cached contents of files that did not change.
+"""
+
+import os
+import threading
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+# Directories no check looks into
+PRUNE_DIRS = {".git", "node_modules"}
+
+# Upper bound on file contents kept in memory (bytes)
+MAX_CACHED_BYTES = 256 * 1024 * 1024
+
+
+class ProjectIndex:
+    def __init__(self, root, prune_dirs=PRUNE_DIRS):
+        self.root = Path(root)
+        self.prune_dirs = set(prune_dirs)
+        self._dirs = None  # [(dirpath, relative parts, [filenames])] in os.walk order
+        self._stats = {}   # path -> (size, mtime)
+        self._contents = {}
+        self._cached_bytes = 0
+        self._lock = threading.Lock()
+
+    def _ensure(self) -> List[Tuple[str, Tuple[str, ...], List[str]]]:
+        with self._lock:
+            if self._dirs is None:
+                self._dirs = self._scan()
+        return self._dirs
+
+    def _scan(self) -> List[Tuple[str, Tuple[str, ...], List[str]]]:
+        """Top-down, depth-first walk in the same order os.walk and glob use"""
+        dirs = []
+        stack = [(str(self.root), ())]
+        while stack:
+            dirpath, parts = stack.pop()
+            filenames, subdirs = [], []
+            try:
+                with os.scandir(dirpath) as it:
+                    for entry in it:
+                        try:
+                            is_dir = entry.is_dir()
+                        except OSError:
+                            is_dir = False
+                        if is_dir:
+                            # Like os.walk, don't descend into symlinked directories
+                            if entry.name not in self.prune_dirs and not entry.is_symlink():
+                                subdirs.append(entry.name)
+                            continue
+                        filenames.append(entry.name)
+                        try:
+                            st = entry.stat()
+                            self._stats[entry.path] = (st.st_size, st.st_mtime)
+                        except OSError:
+                            self._stats[entry.path] = (0, 0.0)
+            except OSError:
+                continue
+            dirs.append((dirpath, parts, filenames))
+            for name in reversed(subdirs):
+                stack.append((os.path.join(dirpath, name), parts + (name,)))
+        return dirs
+
+    def refresh(self):
+        """Re-walk the tree; cached contents survive for files with the same size and mtime"""
+        with self._lock:
+            old_stats, self._stats = self._stats, {}
+            self._dirs = self._scan()
+            for path in [p for p in self._contents if self._stats.get(p) != old_stats.get(p)]:
+                self._cached_bytes -= len(self._contents.pop(path))
+
+    def _walk(self, skip_dirs=()) -> Iterator[Tuple[str, Tuple[str, ...], List[str]]]:
+        skip_dirs = set(skip_dirs)
+        for dirpath, parts, filenames in self._ensure():
+            if skip_dirs and any(part in skip_dirs for part in parts):
+                continue
+            yield dirpath, parts, filenames
+
+    def walk(self, skip_dirs=()) -> Iterator[Tuple[str, List[str]]]:
+        """Yield (dirpath, filenames) for directories not under a skipped name"""
+        for dirpath, _, filenames in self._walk(skip_dirs):
+            yield dirpath, filenames
+
+    def files(self, suffix: str = "", skip_dirs=(), parent: Optional[str] = None,
+              under: Optional[str] = None) -> List[Path]:
+        """
+        Paths of indexed files ending in suffix (case-sensitive, like glob).
+        parent / under restrict matches to files directly inside / anywhere
+        below a directory with that name (relative to the root).
+        """
+        matches = []
+        for dirpath, parts, filenames in self._walk(skip_dirs):
+            if parent is not None and parts[-1:] != (parent,):
+                continue
+            if under is not None and under not in parts:
+                continue
+            matches.extend(Path(dirpath) / name for name in filenames if name.endswith(suffix))
+        return matches
+
+    def stat(self, path) -> Tuple[int, float]:
+        """(size, mtime) of an indexed file"""
+        self._ensure()
+        return self._stats.get(str(path), (0, 0.0))
+
+    def read_bytes(self, path) -> bytes:
+        """File contents; cached, so each file is read from disk once per run"""
+        key = str(path)
+        data = self._contents.get(key)
+        if data is None:
+            with open(key, "rb") as f:
+                data = f.read()
+            with self._lock:
+                if self._cached_bytes + len(data) <= MAX_CACHED_BYTES:
+                    self._contents[key] = data
+                    self._cached_bytes += len(data)
+        return data
+
+    def read_text(self, path, errors: str = "ignore") -> str:
+        """Read a file as UTF-8 text (universal newlines, like open())"""
+        text = self.read_bytes(path).decode("utf-8", errors=errors)
+        return text.replace("\r\n", "\n").replace("\r", "\n")
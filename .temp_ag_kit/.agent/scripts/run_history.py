@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Run History - Antigravity Kit
+=============================
+
+Per-check timings from earlier checklist.py / verify_all.py runs, kept
+next to the results cache as one JSON line per run:
+
+    {"time": "2026-01-01T12:00:00", "files": 1834, "wall": 9.7,
+     "checks": {"Security Scan": {"duration": 4.2, "start": 0.0, "passed": true,
+                                  "findings": 9, "metrics": {...}}}}
+
+"start" is seconds after the run began, "files" the number of project files.
+
+Used to:
+    - size each subprocess check's time budget: a check that usually takes
+      10s is stopped long before the fixed 5/10 minute timeout would fire
+    - estimate durations, so the scheduler starts the slowest checks first
+    - report trends, p95 and the critical path (--report timings)
+"""
+
+import json
+import math
+import os
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from verify_cache import project_cache_file
+
+# Runs of history consulted per check
+HISTORY_RUNS = 20
+
+# Fewer samples than this: keep the caller's default timeout
+MIN_SAMPLES = 3
+
+# Budget = p95 duration x BUDGET_FACTOR, but never below MIN_BUDGET seconds
+BUDGET_FACTOR = 3
+MIN_BUDGET = 60
+
+# Rewrite the file down to HISTORY_RUNS runs once it grows past this
+MAX_LINES = 10 * HISTORY_RUNS
+
+# Checks faster than this (median seconds) get no trend; their changes are noise
+MIN_TREND_SECONDS = 0.1
+
+# Scheduling jitter (seconds) still counted as "started right after" in the critical path
+PATH_SLACK = 0.25
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile"""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def _seconds(value: float) -> str:
+    return f"{value:.1f}s"
+
+
+def critical_path(checks: Dict[str, dict]) -> List[str]:
+    """
+    The chain of checks that set a run's wall time: start from the check
+    that finished last and keep stepping back to the check that finished
+    right before it started (its dependency, or the one whose slot it took).
+    """
+    timed = {name: c for name, c in checks.items() if "start" in c}
+    if not timed:
+        return []
+
+    def end(name):
+        return timed[name]["start"] + timed[name]["duration"]
+
+    name = max(timed, key=end)
+    path = [name]
+    while timed[name]["start"] > PATH_SLACK:
+        start = timed[name]["start"]
+        before = [n for n in timed if n not in path and end(n) <= start + PATH_SLACK]
+        if not before:
+            break
+        name = max(before, key=end)
+        if start - end(name) > PATH_SLACK:
+            break  # idle gap: nothing was holding the check up
+        path.append(name)
+    return path[::-1]
+
+
+class RunHistory:
+    def __init__(self, project_path, cache_dir=None):
+        self.path = project_cache_file(project_path, ".history.jsonl", cache_dir)
+        self.runs = []
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        self.runs.append(json.loads(line))
+                    except ValueError:
+                        continue  # a line cut short by an interrupted write
+        except OSError:
+            pass
+
+    def durations(self, name: str) -> List[float]:
+        """Durations of the check's last HISTORY_RUNS real runs, oldest first"""
+        found = [run["checks"][name]["duration"] for run in self.runs if name in run.get("checks", {})]
+        return found[-HISTORY_RUNS:]
+
+    def budget(self, name: str, default: float) -> float:
+        """Time limit for one run of the check, from its past durations"""
+        samples = self.durations(name)
+        if len(samples) < MIN_SAMPLES:
+            return default
+        return min(default, max(MIN_BUDGET, percentile(samples, 95) * BUDGET_FACTOR))
+
+    def estimate(self, name: str, default: float) -> float:
+        """Typical duration of the check (median of recent runs)"""
+        samples = self.durations(name)
+        return percentile(samples, 50) if samples else default
+
+    def record(self, results: List[dict], files: Optional[int] = None):
+        """Append this run; only checks that actually ran to completion say anything about duration"""
+        checks: Dict[str, dict] = {}
+        for r in results:
+            if r.get("cached") or r.get("skipped") or r.get("timeout") or r.get("exception") or "duration" not in r:
+                continue
+            entry = {"duration": round(r["duration"], 3), "passed": bool(r["passed"]),
+                     "findings": sum(r.get("severity_counts", {}).values())}
+            if "start" in r:
+                entry["start"] = round(r["start"], 3)
+            if r.get("metrics"):
+                entry["metrics"] = r["metrics"]
+            checks[r["name"]] = entry
+        if not checks:
+            return
+        run = {"time": datetime.now().isoformat(timespec="seconds"), "checks": checks}
+        if files is not None:
+            run["files"] = files
+        ends = [r["end"] for r in results if "end" in r]
+        if ends:
+            run["wall"] = round(max(ends), 3)
+        self.runs.append(run)
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            if len(self.runs) > MAX_LINES:
+                self.runs = self.runs[-HISTORY_RUNS:]
+                tmp = self.path.with_suffix(".tmp")
+                with open(tmp, "w", encoding="utf-8") as f:
+                    f.writelines(json.dumps(run) + "\n" for run in self.runs)
+                os.replace(tmp, self.path)
+            else:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(self.runs[-1]) + "\n")
+        except OSError:
+            pass
+
+    def report(self) -> List[str]:
+        """Lines of the --report timings table"""
+        runs = self.runs[-HISTORY_RUNS:]
+        if not runs:
+            return ["No recorded runs yet for this project."]
+        names = []
+        for run in runs:
+            names += [name for name in run["checks"] if name not in names]
+        width = max(len(name) for name in names) + 2
+        lines = [f"{'Check':<{width}}{'Runs':>5}{'Last':>9}{'Median':>9}{'p95':>9}{'Trend':>8}{'Findings':>10}"]
+        # Slowest first: the checks worth looking at
+        for name in sorted(names, key=lambda n: -percentile(self.durations(n), 95)):
+            samples = self.durations(name)
+            last = next(run["checks"][name] for run in reversed(runs) if name in run["checks"])
+            trend = ""
+            if len(samples) >= 4:
+                # Newer half vs older half of the samples
+                half = len(samples) // 2
+                old, new = percentile(samples[:half], 50), percentile(samples[-half:], 50)
+                trend = f"{(new - old) / old:+.0%}" if old >= MIN_TREND_SECONDS else ""
+            lines.append(f"{name:<{width}}{len(samples):>5}{_seconds(samples[-1]):>9}"
+                         f"{_seconds(percentile(samples, 50)):>9}{_seconds(percentile(samples, 95)):>9}"
+                         f"{trend:>8}{last.get('findings', 0):>10}")
+        lines.append("")
+        last_run = runs[-1]
+        path = critical_path(last_run["checks"])
+        if path:
+            wall = f" ({_seconds(last_run['wall'])} wall)" if "wall" in last_run else ""
+            lines.append(f"Critical path, last run{wall}:")
+            lines.append("  " + " -> ".join(f"{n} {_seconds(last_run['checks'][n]['duration'])}" for n in path))
+        sized = [run["files"] for run in runs if "files" in run]
+        if sized:
+            lines.append(f"Project files: {sized[0]} -> {sized[-1]} over {len(runs)} runs")
+        return lines
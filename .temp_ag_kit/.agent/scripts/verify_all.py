@@ -8,6 +8,12 @@ Use this before deployment or major releases.
 
 Usage:
     python scripts/verify_all.py . --url <URL>
+    python scripts/verify_all.py . --url <URL> --isolate   # Subprocess per check
+    python scripts/verify_all.py . --url <URL> --no-cache  # Ignore earlier results
+    python scripts/verify_all.py . --url <URL> --stop-on-critical
+    python scripts/verify_all.py . --url <URL> --fail-fast  # Kill running checks on failure
+    python scripts/verify_all.py . --report timings         # Trends, p95, critical path
+    python scripts/verify_all.py . --url <URL> --format sarif -o out.sarif
 
 Includes ALL checks:
     ✅ Security Scan (OWASP, secrets, dependencies)
@@ -20,15 +26,36 @@ Includes ALL checks:
     ✅ Playwright E2E
     ✅ Bundle Analysis (if applicable)
     ✅ Mobile Audit (if applicable)
+
+Checks run concurrently within per-resource-class limits (CPU-bound scans,
+I/O-bound scans, browser, network); long browser checks start first, so a
+full run takes roughly as long as its slowest check rather than the sum.
+Skill scripts that expose run() (see check_runner) are called in-process
+unless --isolate is given. Results of checks that only read project files
+are cached between runs (see verify_cache). Checks stream progress and
+findings as events (see check_runner); --stop-on-critical ends the run at the
+first critical finding from a required check. --fail-fast stops at the first
+failed required check and kills the checks still running. Subprocess checks
+get time budgets from their durations in earlier runs (see run_history),
+which also order the schedule. --format json|sarif also writes one merged
+findings document for CI (see findings_report).
 """
 
 import sys
-import subprocess
+import time
 import argparse
 from pathlib import Path
 from typing import List, Dict, Optional
 from datetime import datetime
 
+from check_runner import (RESOURCE_LIMITS, EventLog, ProgressBoard, RunControl, cancelled_result,
+                          format_severity_counts, load_plugin, run_checks, run_plugin,
+                          run_subprocess)
+from project_index import ProjectIndex
+from findings_report import FindingsReport
+from run_history import RunHistory
+from verify_cache import VerifyCache
+
 # ANSI colors
 class Colors:
     HEADER = '\033[95m'
@@ -147,57 +174,96 @@ VERIFICATION_SUITE = [
     },
 ]
 
-def run_script(name: str, script_path: Path, project_path: str, url: Optional[str] = None) -> dict:
-    """Run validation script"""
+# Resource class of each check (see check_runner); unlisted checks count as "cpu"
+RESOURCE_CLASSES = {
+    "Security Scan": "cpu",
+    "Dependency Analysis": "network",
+    "Lint Check": "cpu",
+    "Type Coverage": "io",
+    "Schema Validation": "io",
+    "Test Suite": "cpu",
+    "UX Audit": "cpu",
+    "Accessibility Check": "io",
+    "SEO Check": "io",
+    "GEO Check": "io",
+    "Lighthouse Audit": "browser",
+    "Bundle Analysis": "cpu",
+    "Playwright E2E": "browser",
+    "Mobile Audit": "cpu",
+    "i18n Check": "io",
+}
+
+# Rough typical durations (seconds) until run history has real ones; used only to start long checks first
+CHECK_ESTIMATES = {
+    "Playwright E2E": 120,
+    "Lighthouse Audit": 90,
+    "Test Suite": 60,
+    "Lint Check": 45,
+    "Security Scan": 30,
+    "Dependency Analysis": 20,
+    "Bundle Analysis": 20,
+}
+
+def run_script(name: str, script_path: Path, project_path: str, url: Optional[str] = None,
+               events: Optional[EventLog] = None, timeout: float = 600,
+               control: Optional[RunControl] = None) -> dict:
+    """Run validation script (on a worker thread, so no printing; see print_result)"""
     if not script_path.exists():
-        print_warning(f"{name}: Script not found, skipping")
-        return {"name": name, "passed": True, "skipped": True, "duration": 0}
+        return {"name": name, "passed": True, "skipped": True, "duration": 0, "error": "Script not found"}
     
-    print_step(f"Running: {name}")
-    start_time = datetime.now()
+    start_time = time.monotonic()
     
     # Build command
     cmd = ["python", str(script_path), project_path]
     if url and ("lighthouse" in script_path.name.lower() or "playwright" in script_path.name.lower()):
         cmd.append(url)
     
-    # Run
+    # Run; event lines go to events as the script prints them, and the script
+    # is killed after timeout seconds or when control cancels the run
     try:
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=600  # 10 minute timeout for slow checks
-        )
+        result = run_subprocess(cmd, timeout, events, control, name)
         
-        duration = (datetime.now() - start_time).total_seconds()
-        passed = result.returncode == 0
+        if result["timeout"]:
+            return {"name": name, "passed": False, "skipped": False, "timeout": True,
+                    "duration": time.monotonic() - start_time, "error": "Timeout"}
         
-        if passed:
-            print_success(f"{name}: PASSED ({duration:.1f}s)")
-        else:
-            print_error(f"{name}: FAILED ({duration:.1f}s)")
-            if result.stderr:
-                print(f"  {result.stderr[:300]}")
+        if result["cancelled"]:
+            return cancelled_result(name, control, time.monotonic() - start_time)
         
         return {
             "name": name,
-            "passed": passed,
-            "output": result.stdout,
-            "error": result.stderr,
+            "passed": result["returncode"] == 0,
+            "output": result["output"],
+            "error": result["error"],
             "skipped": False,
-            "duration": duration
+            "duration": time.monotonic() - start_time
         }
     
-    except subprocess.TimeoutExpired:
-        duration = (datetime.now() - start_time).total_seconds()
-        print_error(f"{name}: TIMEOUT (>{duration:.0f}s)")
-        return {"name": name, "passed": False, "skipped": False, "duration": duration, "error": "Timeout"}
-    
     except Exception as e:
-        duration = (datetime.now() - start_time).total_seconds()
-        print_error(f"{name}: ERROR - {str(e)}")
-        return {"name": name, "passed": False, "skipped": False, "duration": duration, "error": str(e)}
+        return {"name": name, "passed": False, "skipped": False, "exception": True,
+                "duration": time.monotonic() - start_time, "error": str(e)}
+
+def print_result(result: dict):
+    """Print one check result (called in priority order)"""
+    name = result["name"]
+    duration = result.get("duration", 0)
+    timing = "cached" if result.get("cached") else f"{duration:.1f}s"
+    if result.get("skipped"):
+        reason = result["error"] if result.get("blocked") or result.get("cancelled") else "Script not found"
+        print_warning(f"{name}: {reason}, skipping")
+    elif result.get("timeout"):
+        print_error(f"{name}: TIMEOUT (>{duration:.0f}s)")
+    elif result.get("exception"):
+        print_error(f"{name}: ERROR - {result['error']}")
+    elif result["passed"]:
+        print_success(f"{name}: PASSED ({timing})")
+    else:
+        print_error(f"{name}: FAILED ({timing})")
+        if result.get("error"):
+            print(f"  {result['error'][:300]}")
+    counts = result.get("severity_counts")
+    if counts:
+        print(f"  Findings: {format_severity_counts(counts)}")
 
 def print_final_report(results: List[dict], start_time: datetime):
     """Print comprehensive final report"""
@@ -268,14 +334,26 @@ def main():
 Examples:
   python scripts/verify_all.py . --url http://localhost:3000
   python scripts/verify_all.py . --url https://staging.example.com --no-e2e
+  python scripts/verify_all.py . --report timings
+  python scripts/verify_all.py . --url http://localhost:3000 --format sarif -o verify.sarif
         """
     )
     parser.add_argument("project", help="Project path to validate")
-    parser.add_argument("--url", required=True, help="URL for performance & E2E checks")
+    parser.add_argument("--url", help="URL for performance & E2E checks (required unless --report)")
     parser.add_argument("--no-e2e", action="store_true", help="Skip E2E tests")
     parser.add_argument("--stop-on-fail", action="store_true", help="Stop on first failure")
+    parser.add_argument("--report", choices=["timings"], help="Show check timings from earlier runs (trend, p95, critical path) and exit")
+    parser.add_argument("--fail-fast", action="store_true", help="Like --stop-on-fail, and kill the checks still running")
+    parser.add_argument("--isolate", action="store_true", help="Run every check in its own Python subprocess (enforces timeouts)")
+    parser.add_argument("--no-cache", action="store_true", help="Don't reuse or save results from earlier runs")
+    parser.add_argument("--stop-on-critical", action="store_true", help="Stop as soon as a required check reports a critical finding")
+    parser.add_argument("--format", choices=["text", "json", "sarif"], default="text", help="Also write a merged findings document (to --output, default stdout; the text report then goes to stderr)")
+    parser.add_argument("--output", "-o", help="File for the --format json|sarif document")
+    parser.add_argument("--jobs", "-j", type=int, default=None, help=f"Max concurrent CPU-bound checks (default: {RESOURCE_LIMITS['cpu']})")
     
     args = parser.parse_args()
+    if not args.url and not args.report:
+        parser.error("the following arguments are required: --url")
     
     project_path = Path(args.project).resolve()
     
@@ -283,15 +361,30 @@ Examples:
         print_error(f"Project path does not exist: {project_path}")
         sys.exit(1)
     
+    history = RunHistory(project_path)
+    if args.report == "timings":
+        print_header("📈 CHECK TIMINGS")
+        print(f"Project: {project_path}\n")
+        for line in history.report():
+            print(line)
+        sys.exit(0)
+    
+    findings = None
+    if args.format != "text":
+        document = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+        if not args.output:
+            # The document owns stdout; the human-readable report moves to stderr
+            sys.stdout = sys.stderr
+        findings = FindingsReport(document, args.format, str(project_path))
+    
     print_header("🚀 ANTIGRAVITY KIT - FULL VERIFICATION SUITE")
     print(f"Project: {project_path}")
     print(f"URL: {args.url}")
     print(f"Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     
     start_time = datetime.now()
-    results = []
     
-    # Run all verification categories
+    checks = []
     for suite in VERIFICATION_SUITE:
         category = suite["category"]
         requires_url = suite.get("requires_url", False)
@@ -304,19 +397,101 @@ Examples:
         if args.no_e2e and category == "E2E Testing":
             continue
         
-        print_header(f"📋 {category.upper()}")
-        
         for name, script_path, required in suite["checks"]:
-            script = project_path / script_path
-            result = run_script(name, script, str(project_path), args.url)
-            result["category"] = category
-            results.append(result)
-            
-            # Stop on critical failure if flag set
-            if args.stop_on_fail and required and not result["passed"] and not result.get("skipped"):
-                print_error(f"CRITICAL: {name} failed. Stopping verification.")
-                print_final_report(results, start_time)
-                sys.exit(1)
+            checks.append({
+                "name": name,
+                "script": project_path / script_path,
+                "required": required,
+                "category": category,
+                "resource": RESOURCE_CLASSES.get(name, "cpu"),
+                "estimate": history.estimate(name, CHECK_ESTIMATES.get(name, 5)),
+            })
+    
+    limits = dict(RESOURCE_LIMITS)
+    if args.jobs:
+        limits["cpu"] = args.jobs
+    print("Concurrency: " + ", ".join(f"{k}={v}" for k, v in limits.items()))
+    
+    # Import in-process plugins up front, on this thread
+    plugins = {} if args.isolate else {
+        check["name"]: load_plugin(check["script"])
+        for check in checks if check["script"].exists()
+    }
+    # One shared walk of the project for every in-process check
+    context = {"project": str(project_path), "url": args.url, "index": ProjectIndex(project_path)}
+    cache = None if args.no_cache else VerifyCache(project_path, context["index"])
+    
+    board = ProgressBoard()
+    control = RunControl(cancel_running=args.fail_fast)
+    
+    def is_critical(check: dict, counts: dict) -> bool:
+        return bool(args.stop_on_critical and check["required"] and counts.get("critical"))
+    
+    def execute(check: dict) -> dict:
+        def listener(name: str, event: dict):
+            board.update(name, event)
+            if findings and event["event"] == "finding":
+                findings.add(name, event)
+            if event["event"] == "finding" and is_critical(check, {event.get("severity"): 1}):
+                control.stop(name, "reported a critical finding")
+        
+        # Browser and network checks depend on more than the files; never cache them
+        key = cache.check_key(check) if cache and check["resource"] not in ("browser", "network") else None
+        # A cached result replays no findings; for a findings document, run (per-file memos still apply)
+        result = cache.lookup(check, key) if key and not findings else None
+        if not result:
+            events = EventLog(check["name"], listener)
+            if plugins.get(check["name"]):
+                check_context = dict(context, emit=events)
+                if key:
+                    check_context["memo"] = cache.memo(check["name"], key)
+                result = run_plugin(plugins[check["name"]], check["name"], str(project_path), check_context, control)
+            else:
+                result = run_script(check["name"], check["script"], str(project_path), args.url, events,
+                                    history.budget(check["name"], 600), control)
+            result.update(events.summary())
+            if key:
+                cache.store(check, key, result)
+        board.finish(check["name"])
+        # A cached result replays no events; stop on its recorded counts
+        if is_critical(check, result.get("severity_counts", {})):
+            control.stop(check["name"], "reported a critical finding")
+        return result
+    
+    categories = {check["name"]: check["category"] for check in checks}
+    shown = set()
+    
+    def report(result: dict):
+        board.clear()
+        result["category"] = categories[result["name"]]
+        if result["category"] not in shown:
+            shown.add(result["category"])
+            print_header(f"📋 {result['category'].upper()}")
+        print_result(result)
+    
+    results, stopped_by = run_checks(
+        checks,
+        execute,
+        jobs=sum(limits.values()),
+        on_result=report,
+        limits=limits,
+        fail_fast=args.stop_on_fail or args.fail_fast,
+        control=control
+    )
+    
+    if cache:
+        cache.save()
+    history.record(results, files=sum(len(names) for _, names in context["index"].walk()))
+    if findings:
+        findings.close(results, categories)
+        if args.output:
+            findings.stream.close()
+    
+    # Stop on critical failure if flag set
+    if stopped_by:
+        print_error(f"CRITICAL: {stopped_by} {control.reason}. Stopping verification.")
+        print_final_report(results, start_time)
+        sys.exit(1)
     
     # Print final report
     all_passed = print_final_report(results, start_time)
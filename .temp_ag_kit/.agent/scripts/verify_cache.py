@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Verify Cache - Antigravity Kit
+==============================
+
+Persistent results cache for checklist.py and verify_all.py, so re-running
+the checks after a small edit only redoes the work that edit affects.
+
+Two levels:
+
+    Whole check   A check's last result is reused when its script is
+                  unchanged and no file in the project changed since.
+    Per file      File-local checks get context["memo"] (a FileMemo) and
+                  wrap their per-file function with memo.call(fn, path, ...);
+                  unchanged files return their cached findings, which the
+                  check aggregates as usual. Checks scanning files in
+                  batches use memo.lookup() / memo.store() instead.
+
+Files are identified by content digest (git's blob id format), found as
+cheaply as possible:
+
+    1. git      - clean tracked files take their blob id from `git ls-files -s`
+                  (files listed by `git diff` are hashed instead)
+    2. snapshot - same size and mtime as last run: the digest recorded then
+    3. content  - otherwise the file is read and hashed
+
+The cache lives outside the project, in ~/.cache/antigravity-kit/verify
+(or $AG_KIT_CACHE_DIR), one JSON file per project path.
+"""
+
+import hashlib
+import json
+import os
+import subprocess
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+CACHE_VERSION = 1
+
+# Files above this size are hashed from disk in chunks instead of through the index
+STREAM_HASH_BYTES = 1024 * 1024
+
+# Tool caches that change on every run without the code changing
+STATE_SKIP_DIRS = {"__pycache__", ".pytest_cache", ".mypy_cache", ".ruff_cache"}
+
+
+def default_cache_dir() -> Path:
+    base = os.environ.get("AG_KIT_CACHE_DIR")
+    if base:
+        return Path(base)
+    xdg = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return Path(xdg) / "antigravity-kit" / "verify"
+
+
+def project_cache_file(project_path, suffix: str, cache_dir=None) -> Path:
+    """Per-project file in the cache directory, e.g. <key>.json"""
+    key = hashlib.sha1(str(Path(project_path)).encode("utf-8")).hexdigest()[:16]
+    return Path(cache_dir or default_cache_dir()) / f"{key}{suffix}"
+
+
+def blob_digest(data: bytes) -> str:
+    """Same id `git hash-object` gives the content"""
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+
+def _stream_digest(path: str, size: int) -> str:
+    h = hashlib.sha1(b"blob %d\0" % size)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _git_blobs(root: Path) -> Dict[str, str]:
+    """Relative path -> blob id for tracked files whose working copy is unmodified"""
+    def git(*args):
+        return subprocess.run(["git", *args], cwd=str(root), capture_output=True, timeout=60, check=True).stdout
+    try:
+        staged = git("ls-files", "-s", "-z")
+        dirty = set(git("diff", "--name-only", "--relative", "-z").decode("utf-8", "replace").split("\0"))
+    except (OSError, subprocess.SubprocessError):
+        return {}
+    blobs = {}
+    for entry in staged.decode("utf-8", "replace").split("\0"):
+        if not entry:
+            continue
+        meta, _, rel = entry.partition("\t")
+        mode, blob, stage = meta.split()
+        # Skip submodules, conflicted entries and files edited since staging
+        if mode == "160000" or stage != "0" or rel in dirty:
+            continue
+        blobs[rel] = blob
+    return blobs
+
+
+class FileMemo:
+    """Per-check cache of per-file results, keyed by relative path + content digest"""
+
+    def __init__(self, cache: "VerifyCache", entries: Dict[str, list]):
+        self._cache = cache
+        self._old = entries
+        self.entries = {}  # entries used or produced this run
+        self.hits = 0
+
+    def lookup(self, path):
+        """(relative path, digest, cached [digest, value] or None); for callers batching the misses"""
+        rel, digest = self._cache.identify(path)
+        old = self._old.get(rel)
+        if digest is None or not old or old[0] != digest:
+            return rel, digest, None
+        self.hits += 1
+        self.entries[rel] = old
+        return rel, digest, old
+
+    def store(self, rel: str, digest: Optional[str], value: Any):
+        if digest is not None:
+            self.entries[rel] = [digest, value]
+
+    def call(self, fn: Callable, path, *args) -> Any:
+        """fn(path, *args), or its cached (JSON-serializable) result for this file content"""
+        rel, digest, entry = self.lookup(path)
+        if entry:
+            return entry[1]
+        value = fn(path, *args)
+        self.store(rel, digest, value)
+        return value
+
+
+class VerifyCache:
+    def __init__(self, project_path, index, cache_dir=None):
+        self.root = Path(project_path)
+        self.index = index
+        self.path = project_cache_file(self.root, ".json", cache_dir)
+        self._lock = threading.Lock()
+        self._state_lock = threading.Lock()
+        self._state = None
+        self._git = None
+        self._memos = {}
+        data = {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            pass
+        if data.get("version") != CACHE_VERSION:
+            data = {}
+        self.files = data.get("files", {})    # rel -> [size, mtime, digest]
+        self.checks = data.get("checks", {})  # name -> {"key", "state", "result"}
+        self.memos = data.get("memos", {})    # name -> {"key", "entries"}
+
+    # -- file identity -----------------------------------------------------
+
+    def identify(self, path):
+        """(relative path, content digest or None if unreadable)"""
+        path = str(path)
+        rel = os.path.relpath(path, self.root)
+        with self._lock:
+            if self._git is None:
+                self._git = _git_blobs(self.root)
+            blob = self._git.get(rel.replace(os.sep, "/"))
+        if blob:
+            return rel, blob
+        size, mtime = self.index.stat(path)
+        known = self.files.get(rel)
+        if known and known[0] == size and known[1] == mtime:
+            return rel, known[2]
+        try:
+            if size > STREAM_HASH_BYTES:
+                digest = _stream_digest(path, size)
+            else:
+                digest = blob_digest(self.index.read_bytes(path))
+        except OSError:
+            return rel, None
+        with self._lock:
+            self.files[rel] = [size, mtime, digest]
+        return rel, digest
+
+    def state(self) -> str:
+        """Digest of the whole project tree (paths + contents), computed once per run"""
+        with self._state_lock:
+            if self._state is None:
+                h = hashlib.sha1()
+                seen = set()
+                for dirpath, filenames in self.index.walk(STATE_SKIP_DIRS):
+                    for name in filenames:
+                        rel, digest = self.identify(os.path.join(dirpath, name))
+                        seen.add(rel)
+                        h.update(f"{rel}\0{digest}\n".encode("utf-8", "replace"))
+                with self._lock:
+                    # Forget snapshots of files that no longer exist
+                    self.files = {rel: v for rel, v in self.files.items() if rel in seen}
+                self._state = h.hexdigest()
+            return self._state
+
+    def reset(self):
+        """Start another run in the same process (watch mode), after save(): git state and tree digest are redone"""
+        with self._state_lock, self._lock:
+            self._state = None
+            self._git = None
+            self._memos = {}
+
+    # -- check results -----------------------------------------------------
+
+    @staticmethod
+    def check_key(check: dict, options: Optional[dict] = None) -> str:
+        """Script version (content hash) + options that change the result"""
+        try:
+            with open(check["script"], "rb") as f:
+                version = blob_digest(f.read())
+        except OSError:
+            version = "missing"
+        return f"{version}:{json.dumps(options or {}, sort_keys=True)}"
+
+    def lookup(self, check: dict, key: str) -> Optional[dict]:
+        """The cached result if the check and the project are unchanged"""
+        entry = self.checks.get(check["name"])
+        # No entry: don't pay for hashing the tree before there is anything to reuse
+        if not entry or entry["key"] != key or entry["state"] != self.state():
+            return None
+        return dict(entry["result"], cached=True, duration=0.0)
+
+    def store(self, check: dict, key: str, result: dict):
+        # Timeouts and crashes say nothing about the code; don't keep them
+        if result.get("skipped") or result.get("timeout") or result.get("exception"):
+            return
+        state = self.state()
+        with self._lock:
+            self.checks[check["name"]] = {"key": key, "state": state, "result": result}
+
+    def memo(self, name: str, key: str) -> FileMemo:
+        """FileMemo for one check; discarded if the check's key changed"""
+        stored = self.memos.get(name, {})
+        memo = FileMemo(self, stored.get("entries", {}) if stored.get("key") == key else {})
+        with self._lock:
+            self._memos[name] = (key, memo)
+        return memo
+
+    def save(self):
+        for name, (key, memo) in self._memos.items():
+            self.memos[name] = {"key": key, "entries": memo.entries}
+        data = {"version": CACHE_VERSION, "project": str(self.root),
+                "files": self.files, "checks": self.checks, "memos": self.memos}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f, default=str)
+            os.replace(tmp, self.path)
+        except OSError:
+            pass
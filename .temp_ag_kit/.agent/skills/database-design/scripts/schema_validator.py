@@ -26,17 +26,23 @@ except:
     pass
 
 
-def find_schema_files(project_path: Path) -> list:
-    """Find database schema files."""
+def find_schema_files(project_path: Path, index=None) -> list:
+    """Find database schema files (from the shared project index if given)."""
     schemas = []
     
     # Prisma schema
-    prisma_files = list(project_path.glob('**/prisma/schema.prisma'))
+    if index:
+        prisma_files = [f for f in index.files('schema.prisma', parent='prisma') if f.name == 'schema.prisma']
+    else:
+        prisma_files = list(project_path.glob('**/prisma/schema.prisma'))
     schemas.extend([('prisma', f) for f in prisma_files])
     
     # Drizzle schema files
-    drizzle_files = list(project_path.glob('**/drizzle/*.ts'))
-    drizzle_files.extend(project_path.glob('**/schema/*.ts'))
+    if index:
+        drizzle_files = index.files('.ts', parent='drizzle') + index.files('.ts', parent='schema')
+    else:
+        drizzle_files = list(project_path.glob('**/drizzle/*.ts'))
+        drizzle_files.extend(project_path.glob('**/schema/*.ts'))
     for f in drizzle_files:
         if 'schema' in f.name.lower() or 'table' in f.name.lower():
             schemas.append(('drizzle', f))
@@ -44,12 +50,15 @@ def find_schema_files(project_path: Path) -> list:
     return schemas[:10]  # Limit
 
 
-def validate_prisma_schema(file_path: Path) -> list:
+def validate_prisma_schema(file_path: Path, index=None) -> list:
     """Validate Prisma schema file."""
     issues = []
     
     try:
-        content = file_path.read_text(encoding='utf-8', errors='ignore')
+        if index:
+            content = index.read_text(file_path)
+        else:
+            content = file_path.read_text(encoding='utf-8', errors='ignore')
         
         # Find all models
         models = re.findall(r'model\s+(\w+)\s*{([^}]+)}', content, re.DOTALL)
@@ -91,22 +100,17 @@ def validate_prisma_schema(file_path: Path) -> list:
     return issues
 
 
-def main():
-    project_path = Path(sys.argv[1] if len(sys.argv) > 1 else ".").resolve()
-    
-    print(f"\n{'='*60}")
-    print(f"[SCHEMA VALIDATOR] Database Schema Validation")
-    print(f"{'='*60}")
-    print(f"Project: {project_path}")
-    print(f"Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print("-"*60)
-    
-    # Find schema files
-    schemas = find_schema_files(project_path)
-    print(f"Found {len(schemas)} schema files")
+def run(project_path, context: dict = None) -> dict:
+    """
+    In-process entry point used by checklist.py / verify_all.py.
+    Returns the same report main() prints, without printing.
+    """
+    project_path = Path(project_path).resolve()
+    index = (context or {}).get("index")
+    schemas = find_schema_files(project_path, index)
     
     if not schemas:
-        output = {
+        return {
             "script": "schema_validator",
             "project": str(project_path),
             "schemas_checked": 0,
@@ -114,17 +118,13 @@ def main():
             "passed": True,
             "message": "No schema files found"
         }
-        print(json.dumps(output, indent=2))
-        sys.exit(0)
     
     # Validate each schema
     all_issues = []
     
     for schema_type, file_path in schemas:
-        print(f"\nValidating: {file_path.name} ({schema_type})")
-        
         if schema_type == 'prisma':
-            issues = validate_prisma_schema(file_path)
+            issues = validate_prisma_schema(file_path, index)
         else:
             issues = []  # Drizzle validation could be added
         
@@ -135,13 +135,44 @@ def main():
                 "issues": issues
             })
     
+    total_issues = sum(len(item["issues"]) for item in all_issues)
+    # Schema issues are warnings, not failures
+    passed = True
+    
+    return {
+        "script": "schema_validator",
+        "project": str(project_path),
+        "schemas_checked": len(schemas),
+        "issues_found": total_issues,
+        "passed": passed,
+        "issues": all_issues
+    }
+
+
+def main():
+    project_path = Path(sys.argv[1] if len(sys.argv) > 1 else ".").resolve()
+    
+    print(f"\n{'='*60}")
+    print(f"[SCHEMA VALIDATOR] Database Schema Validation")
+    print(f"{'='*60}")
+    print(f"Project: {project_path}")
+    print(f"Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print("-"*60)
+    
+    output = run(project_path)
+    print(f"Found {output['schemas_checked']} schema files")
+    
+    if not output["schemas_checked"]:
+        print(json.dumps(output, indent=2))
+        sys.exit(0)
+    
     # Summary
     print("\n" + "="*60)
     print("SCHEMA ISSUES")
     print("="*60)
     
-    if all_issues:
-        for item in all_issues:
+    if output["issues"]:
+        for item in output["issues"]:
             print(f"\n{item['file']} ({item['type']}):")
             for issue in item["issues"][:5]:  # Limit per file
                 print(f"  - {issue}")
@@ -150,19 +181,6 @@ def main():
     else:
         print("No schema issues found!")
     
-    total_issues = sum(len(item["issues"]) for item in all_issues)
-    # Schema issues are warnings, not failures
-    passed = True
-    
-    output = {
-        "script": "schema_validator",
-        "project": str(project_path),
-        "schemas_checked": len(schemas),
-        "issues_found": total_issues,
-        "passed": passed,
-        "issues": all_issues
-    }
-    
     print("\n" + json.dumps(output, indent=2))
     
     sys.exit(0)
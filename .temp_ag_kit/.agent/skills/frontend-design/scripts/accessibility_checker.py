@@ -27,26 +27,30 @@ except:
     pass
 
 
-def find_html_files(project_path: Path) -> list:
-    """Find all HTML/JSX/TSX files."""
+def find_html_files(project_path: Path, index=None) -> list:
+    """Find all HTML/JSX/TSX files (from the shared project index if given)."""
     patterns = ['**/*.html', '**/*.jsx', '**/*.tsx']
     skip_dirs = {'node_modules', '.next', 'dist', 'build', '.git'}
     
     files = []
     for pattern in patterns:
-        for f in project_path.glob(pattern):
+        candidates = index.files(Path(pattern).suffix) if index else project_path.glob(pattern)
+        for f in candidates:
             if not any(skip in f.parts for skip in skip_dirs):
                 files.append(f)
     
     return files[:50]
 
 
-def check_accessibility(file_path: Path) -> list:
+def check_accessibility(file_path: Path, index=None) -> list:
     """Check a single file for accessibility issues."""
     issues = []
     
     try:
-        content = file_path.read_text(encoding='utf-8', errors='ignore')
+        if index:
+            content = index.read_text(file_path)
+        else:
+            content = file_path.read_text(encoding='utf-8', errors='ignore')
         
         # Check for form inputs without labels
         inputs = re.findall(r'<input[^>]*>', content, re.IGNORECASE)
@@ -108,22 +112,20 @@ def check_accessibility(file_path: Path) -> list:
     return issues
 
 
-def main():
-    project_path = Path(sys.argv[1] if len(sys.argv) > 1 else ".").resolve()
-    
-    print(f"\n{'='*60}")
-    print(f"[ACCESSIBILITY CHECKER] WCAG Compliance Audit")
-    print(f"{'='*60}")
-    print(f"Project: {project_path}")
-    print(f"Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print("-"*60)
-    
-    # Find HTML files
-    files = find_html_files(project_path)
-    print(f"Found {len(files)} HTML/JSX/TSX files")
+def run(project_path, context: dict = None) -> dict:
+    """
+    In-process entry point used by checklist.py / verify_all.py.
+    Returns the same report main() prints, without printing; each issue
+    is also sent to context["emit"] as a finding event.
+    """
+    project_path = Path(project_path).resolve()
+    index = (context or {}).get("index")
+    memo = (context or {}).get("memo")
+    emit = (context or {}).get("emit")
+    files = find_html_files(project_path, index)
     
     if not files:
-        output = {
+        return {
             "script": "accessibility_checker",
             "project": str(project_path),
             "files_checked": 0,
@@ -131,25 +133,60 @@ def main():
             "passed": True,
             "message": "No HTML files found"
         }
-        print(json.dumps(output, indent=2))
-        sys.exit(0)
     
     # Check each file
     all_issues = []
     
     for f in files:
-        issues = check_accessibility(f)
+        issues = memo.call(check_accessibility, f, index) if memo else check_accessibility(f, index)
         if issues:
             all_issues.append({
                 "file": str(f.name),
                 "issues": issues
             })
+            if emit:
+                for issue in issues:
+                    emit({"event": "finding", "severity": "medium", "message": issue,
+                          "file": str(f.relative_to(project_path))})
+    
+    total_issues = sum(len(item["issues"]) for item in all_issues)
+    # Accessibility issues are important but not blocking
+    passed = total_issues < 5  # Allow minor issues
+    
+    return {
+        "script": "accessibility_checker",
+        "project": str(project_path),
+        "files_checked": len(files),
+        "files_with_issues": len(all_issues),
+        "issues_found": total_issues,
+        "passed": passed,
+        "issues": all_issues
+    }
+
+
+def main():
+    project_path = Path(sys.argv[1] if len(sys.argv) > 1 else ".").resolve()
+    
+    print(f"\n{'='*60}")
+    print(f"[ACCESSIBILITY CHECKER] WCAG Compliance Audit")
+    print(f"{'='*60}")
+    print(f"Project: {project_path}")
+    print(f"Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print("-"*60)
+    
+    output = run(project_path)
+    print(f"Found {output['files_checked']} HTML/JSX/TSX files")
+    
+    if not output["files_checked"]:
+        print(json.dumps(output, indent=2))
+        sys.exit(0)
     
     # Summary
     print("\n" + "="*60)
     print("ACCESSIBILITY ISSUES")
     print("="*60)
     
+    all_issues = output.pop("issues")
     if all_issues:
         for item in all_issues[:10]:
             print(f"\n{item['file']}:")
@@ -161,22 +198,9 @@ def main():
     else:
         print("No accessibility issues found!")
     
-    total_issues = sum(len(item["issues"]) for item in all_issues)
-    # Accessibility issues are important but not blocking
-    passed = total_issues < 5  # Allow minor issues
-    
-    output = {
-        "script": "accessibility_checker",
-        "project": str(project_path),
-        "files_checked": len(files),
-        "files_with_issues": len(all_issues),
-        "issues_found": total_issues,
-        "passed": passed
-    }
-    
     print("\n" + json.dumps(output, indent=2))
     
-    sys.exit(0 if passed else 1)
+    sys.exit(0 if output["passed"] else 1)
 
 
 if __name__ == "__main__":
@@ -78,13 +78,14 @@ def is_page_file(file_path: Path) -> bool:
     return False
 
 
-def find_web_pages(project_path: Path) -> list:
-    """Find public-facing web pages only."""
+def find_web_pages(project_path: Path, index=None) -> list:
+    """Find public-facing web pages only (from the shared project index if given)."""
     patterns = ['**/*.html', '**/*.htm', '**/*.jsx', '**/*.tsx']
     
     files = []
     for pattern in patterns:
-        for f in project_path.glob(pattern):
+        candidates = index.files(Path(pattern).suffix) if index else project_path.glob(pattern)
+        for f in candidates:
             # Skip excluded directories
             if any(skip in f.parts for skip in SKIP_DIRS):
                 continue
@@ -96,10 +97,13 @@ def find_web_pages(project_path: Path) -> list:
     return files[:30]  # Limit to 30 pages
 
 
-def check_page(file_path: Path) -> dict:
+def check_page(file_path: Path, index=None) -> dict:
     """Check a single web page for GEO elements."""
     try:
-        content = file_path.read_text(encoding='utf-8', errors='ignore')
+        if index:
+            content = index.read_text(file_path)
+        else:
+            content = file_path.read_text(encoding='utf-8', errors='ignore')
     except Exception as e:
         return {'file': str(file_path.name), 'passed': [], 'issues': [f"Error: {e}"], 'score': 0}
     
@@ -219,6 +223,32 @@ def check_page(file_path: Path) -> dict:
     }
 
 
+def run(project_path, context: dict = None) -> dict:
+    """
+    In-process entry point used by checklist.py / verify_all.py.
+    Returns the summary main() prints plus per-page results, without printing.
+    """
+    project_path = Path(project_path).resolve()
+    index = (context or {}).get("index")
+    memo = (context or {}).get("memo")
+    pages = find_web_pages(project_path, index)
+    
+    if not pages:
+        return {"script": "geo_checker", "pages_found": 0, "passed": True}
+    
+    results = [memo.call(check_page, page, index) if memo else check_page(page, index) for page in pages]
+    avg_score = sum(r['score'] for r in results) / len(results)
+    
+    return {
+        "script": "geo_checker",
+        "project": str(project_path),
+        "pages_checked": len(results),
+        "average_score": round(avg_score),
+        "passed": avg_score >= 60,
+        "pages": results
+    }
+
+
 def main():
     target = sys.argv[1] if len(sys.argv) > 1 else "."
     target_path = Path(target).resolve()
@@ -229,24 +259,17 @@ def main():
     print(f"Project: {target_path}")
     print("-" * 60)
     
-    # Find web pages only
-    pages = find_web_pages(target_path)
+    report = run(target_path)
     
-    if not pages:
+    if "pages_found" in report:
         print("\n[!] No public web pages found.")
         print("    Looking for: HTML, JSX, TSX files in pages/app directories")
         print("    Skipping: docs, tests, config files, node_modules")
-        output = {"script": "geo_checker", "pages_found": 0, "passed": True}
-        print("\n" + json.dumps(output, indent=2))
+        print("\n" + json.dumps(report, indent=2))
         sys.exit(0)
     
-    print(f"Found {len(pages)} public pages to analyze\n")
-    
-    # Check each page
-    results = []
-    for page in pages:
-        result = check_page(page)
-        results.append(result)
+    results = report.pop("pages")
+    print(f"Found {len(results)} public pages to analyze\n")
     
     # Print results
     for result in results:
@@ -257,7 +280,7 @@ def main():
                 print(f"    - {issue}")
     
     # Average score
-    avg_score = sum(r['score'] for r in results) / len(results) if results else 0
+    avg_score = sum(r['score'] for r in results) / len(results)
     
     print("\n" + "=" * 60)
     print(f"AVERAGE GEO SCORE: {avg_score:.0f}%")
@@ -273,16 +296,9 @@ def main():
         print("[X] Poor - Content needs GEO optimization")
     
     # JSON output
-    output = {
-        "script": "geo_checker",
-        "project": str(target_path),
-        "pages_checked": len(results),
-        "average_score": round(avg_score),
-        "passed": avg_score >= 60
-    }
-    print("\n" + json.dumps(output, indent=2))
+    print("\n" + json.dumps(report, indent=2))
     
-    sys.exit(0 if avg_score >= 60 else 1)
+    sys.exit(0 if report["passed"] else 1)
 
 
 if __name__ == "__main__":
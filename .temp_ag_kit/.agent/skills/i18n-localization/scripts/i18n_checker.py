@@ -50,8 +50,8 @@ I18N_PATTERNS = [
     r'i18n\.',             # Generic i18n
 ]
 
-def find_locale_files(project_path: Path) -> list:
-    """Find translation/locale files."""
+def find_locale_files(project_path: Path, index=None) -> list:
+    """Find translation/locale files (from the shared project index if given)."""
     patterns = [
         "**/locales/**/*.json",
         "**/translations/**/*.json",
@@ -62,12 +62,18 @@ def find_locale_files(project_path: Path) -> list:
     ]
     
     files = []
-    for pattern in patterns:
-        files.extend(project_path.glob(pattern))
+    if index:
+        for folder in ("locales", "translations", "lang", "i18n"):
+            files.extend(index.files(".json", under=folder))
+        files.extend(index.files(".json", parent="messages"))
+        files.extend(index.files(".po"))
+    else:
+        for pattern in patterns:
+            files.extend(project_path.glob(pattern))
     
     return [f for f in files if 'node_modules' not in str(f)]
 
-def check_locale_completeness(locale_files: list) -> dict:
+def check_locale_completeness(locale_files: list, index=None) -> dict:
     """Check if all locales have the same keys."""
     issues = []
     passed = []
@@ -81,7 +87,8 @@ def check_locale_completeness(locale_files: list) -> dict:
         if f.suffix == '.json':
             try:
                 lang = f.parent.name
-                content = json.loads(f.read_text(encoding='utf-8'))
+                text = index.read_text(f, errors='strict') if index else f.read_text(encoding='utf-8')
+                content = json.loads(text)
                 if lang not in locales:
                     locales[lang] = {}
                 locales[lang][f.stem] = set(flatten_keys(content))
@@ -128,7 +135,7 @@ def flatten_keys(d, prefix=''):
             keys.add(new_key)
     return keys
 
-def check_hardcoded_strings(project_path: Path) -> dict:
+def check_hardcoded_strings(project_path: Path, index=None) -> dict:
     """Check for hardcoded strings in code files."""
     issues = []
     passed = []
@@ -142,7 +149,7 @@ def check_hardcoded_strings(project_path: Path) -> dict:
     
     code_files = []
     for ext in extensions:
-        code_files.extend(project_path.rglob(f"*{ext}"))
+        code_files.extend(index.files(ext) if index else project_path.rglob(f"*{ext}"))
     
     code_files = [f for f in code_files if not any(x in str(f) for x in 
                   ['node_modules', '.git', 'dist', 'build', '__pycache__', 'venv', 'test', 'spec'])]
@@ -156,7 +163,10 @@ def check_hardcoded_strings(project_path: Path) -> dict:
     
     for file_path in code_files[:50]:  # Limit
         try:
-            content = file_path.read_text(encoding='utf-8', errors='ignore')
+            if index:
+                content = index.read_text(file_path)
+            else:
+                content = file_path.read_text(encoding='utf-8', errors='ignore')
             ext = file_path.suffix
             file_type = extensions.get(ext, 'jsx')
             
@@ -196,6 +206,33 @@ def check_hardcoded_strings(project_path: Path) -> dict:
     
     return {'passed': passed, 'issues': issues}
 
+def run(project_path, context: dict = None) -> dict:
+    """
+    In-process entry point used by checklist.py / verify_all.py.
+    Returns locale and code results without printing.
+    """
+    project_path = Path(project_path)
+    index = (context or {}).get("index")
+    
+    # Check locale files
+    locale_files = find_locale_files(project_path, index)
+    locale_result = check_locale_completeness(locale_files, index)
+    
+    # Check hardcoded strings
+    code_result = check_hardcoded_strings(project_path, index)
+    
+    critical_issues = sum(1 for i in locale_result['issues'] + code_result['issues'] if i.startswith("[X]"))
+    
+    return {
+        "script": "i18n_checker",
+        "project": str(project_path),
+        "locale": locale_result,
+        "code": code_result,
+        "critical_issues": critical_issues,
+        "passed": critical_issues == 0
+    }
+
+
 def main():
     target = sys.argv[1] if len(sys.argv) > 1 else "."
     project_path = Path(target)
@@ -204,12 +241,9 @@ def main():
     print("  i18n CHECKER - Internationalization Audit")
     print("=" * 60 + "\n")
     
-    # Check locale files
-    locale_files = find_locale_files(project_path)
-    locale_result = check_locale_completeness(locale_files)
-    
-    # Check hardcoded strings
-    code_result = check_hardcoded_strings(project_path)
+    report = run(project_path)
+    locale_result = report['locale']
+    code_result = report['code']
     
     # Print results
     print("[LOCALE FILES]")
@@ -227,7 +261,7 @@ def main():
         print(f"  {item}")
     
     # Summary
-    critical_issues = sum(1 for i in locale_result['issues'] + code_result['issues'] if i.startswith("[X]"))
+    critical_issues = report['critical_issues']
     
     print("\n" + "=" * 60)
     if critical_issues == 0:
@@ -113,6 +113,35 @@ def run_linter(linter: dict, cwd: Path) -> dict:
     return result
 
 
+def run(project_path, context: dict = None) -> dict:
+    """
+    In-process entry point used by checklist.py / verify_all.py.
+    Runs every detected linter and returns the report, without printing.
+    """
+    project_path = Path(project_path).resolve()
+    project_info = detect_project_type(project_path)
+    
+    if not project_info["linters"]:
+        return {
+            "script": "lint_runner",
+            "project": str(project_path),
+            "type": project_info["type"],
+            "checks": [],
+            "passed": True,
+            "message": "No linters configured"
+        }
+    
+    results = [run_linter(linter, project_path) for linter in project_info["linters"]]
+    
+    return {
+        "script": "lint_runner",
+        "project": str(project_path),
+        "type": project_info["type"],
+        "checks": results,
+        "passed": all(r["passed"] for r in results)
+    }
+
+
 def main():
     project_path = Path(sys.argv[1] if len(sys.argv) > 1 else ".").resolve()
     
@@ -122,41 +151,25 @@ def main():
     print(f"Project: {project_path}")
     print(f"Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     
-    # Detect project type
-    project_info = detect_project_type(project_path)
-    print(f"Type: {project_info['type']}")
-    print(f"Linters: {len(project_info['linters'])}")
+    output = run(project_path)
+    results = output["checks"]
+    print(f"Type: {output['type']}")
+    print(f"Linters: {len(results)}")
     print("-"*60)
     
-    if not project_info["linters"]:
+    if not results:
         print("No linters found for this project type.")
-        output = {
-            "script": "lint_runner",
-            "project": str(project_path),
-            "type": project_info["type"],
-            "checks": [],
-            "passed": True,
-            "message": "No linters configured"
-        }
         print(json.dumps(output, indent=2))
         sys.exit(0)
     
-    # Run each linter
-    results = []
-    all_passed = True
-    
-    for linter in project_info["linters"]:
-        print(f"\nRunning: {linter['name']}...")
-        result = run_linter(linter, project_path)
-        results.append(result)
-        
+    for result in results:
+        print(f"\nRunning: {result['name']}...")
         if result["passed"]:
-            print(f"  [PASS] {linter['name']}")
+            print(f"  [PASS] {result['name']}")
         else:
-            print(f"  [FAIL] {linter['name']}")
+            print(f"  [FAIL] {result['name']}")
             if result["error"]:
                 print(f"  Error: {result['error'][:200]}")
-            all_passed = False
     
     # Summary
     print("\n" + "="*60)
@@ -167,17 +180,9 @@ def main():
         icon = "[PASS]" if r["passed"] else "[FAIL]"
         print(f"{icon} {r['name']}")
     
-    output = {
-        "script": "lint_runner",
-        "project": str(project_path),
-        "type": project_info["type"],
-        "checks": results,
-        "passed": all_passed
-    }
-    
     print("\n" + json.dumps(output, indent=2))
     
-    sys.exit(0 if all_passed else 1)
+    sys.exit(0 if output["passed"] else 1)
 
 
 if __name__ == "__main__":
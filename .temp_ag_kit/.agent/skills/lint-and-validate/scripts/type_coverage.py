@@ -15,13 +15,16 @@ try:
 except AttributeError:
     pass  # Python < 3.7
 
-def check_typescript_coverage(project_path: Path) -> dict:
+def check_typescript_coverage(project_path: Path, index=None) -> dict:
     """Check TypeScript type coverage."""
     issues = []
     passed = []
     stats = {'any_count': 0, 'untyped_functions': 0, 'total_functions': 0}
     
-    ts_files = list(project_path.rglob("*.ts")) + list(project_path.rglob("*.tsx"))
+    if index:
+        ts_files = index.files(".ts") + index.files(".tsx")
+    else:
+        ts_files = list(project_path.rglob("*.ts")) + list(project_path.rglob("*.tsx"))
     ts_files = [f for f in ts_files if 'node_modules' not in str(f) and '.d.ts' not in str(f)]
     
     if not ts_files:
@@ -29,7 +32,10 @@ def check_typescript_coverage(project_path: Path) -> dict:
     
     for file_path in ts_files[:30]:  # Limit
         try:
-            content = file_path.read_text(encoding='utf-8', errors='ignore')
+            if index:
+                content = index.read_text(file_path)
+            else:
+                content = file_path.read_text(encoding='utf-8', errors='ignore')
             
             # Count 'any' usage
             any_matches = re.findall(r':\s*any\b', content)
@@ -71,13 +77,13 @@ def check_typescript_coverage(project_path: Path) -> dict:
     
     return {'type': 'typescript', 'files': len(ts_files), 'passed': passed, 'issues': issues, 'stats': stats}
 
-def check_python_coverage(project_path: Path) -> dict:
+def check_python_coverage(project_path: Path, index=None) -> dict:
     """Check Python type hints coverage."""
     issues = []
     passed = []
     stats = {'untyped_functions': 0, 'typed_functions': 0, 'any_count': 0}
     
-    py_files = list(project_path.rglob("*.py"))
+    py_files = index.files(".py") if index else list(project_path.rglob("*.py"))
     py_files = [f for f in py_files if not any(x in str(f) for x in ['venv', '__pycache__', '.git', 'node_modules'])]
     
     if not py_files:
@@ -85,7 +91,10 @@ def check_python_coverage(project_path: Path) -> dict:
     
     for file_path in py_files[:30]:  # Limit
         try:
-            content = file_path.read_text(encoding='utf-8', errors='ignore')
+            if index:
+                content = index.read_text(file_path)
+            else:
+                content = file_path.read_text(encoding='utf-8', errors='ignore')
             
             # Count Any usage
             any_matches = re.findall(r':\s*Any\b', content)
@@ -125,42 +134,61 @@ def check_python_coverage(project_path: Path) -> dict:
     
     return {'type': 'python', 'files': len(py_files), 'passed': passed, 'issues': issues, 'stats': stats}
 
-def main():
-    target = sys.argv[1] if len(sys.argv) > 1 else "."
-    project_path = Path(target)
-    
-    print("\n" + "=" * 60)
-    print("  TYPE COVERAGE CHECKER")
-    print("=" * 60 + "\n")
+def run(project_path, context: dict = None) -> dict:
+    """
+    In-process entry point used by checklist.py / verify_all.py.
+    Returns per-language results without printing.
+    """
+    project_path = Path(project_path)
+    index = (context or {}).get("index")
     
     results = []
     
     # Check TypeScript
-    ts_result = check_typescript_coverage(project_path)
+    ts_result = check_typescript_coverage(project_path, index)
     if ts_result['files'] > 0:
         results.append(ts_result)
     
     # Check Python
-    py_result = check_python_coverage(project_path)
+    py_result = check_python_coverage(project_path, index)
     if py_result['files'] > 0:
         results.append(py_result)
     
-    if not results:
+    critical_issues = sum(1 for result in results for item in result['issues'] if item.startswith("[X]"))
+    
+    return {
+        "script": "type_coverage",
+        "project": str(project_path),
+        "results": results,
+        "critical_issues": critical_issues,
+        "passed": critical_issues == 0
+    }
+
+
+def main():
+    target = sys.argv[1] if len(sys.argv) > 1 else "."
+    project_path = Path(target)
+    
+    print("\n" + "=" * 60)
+    print("  TYPE COVERAGE CHECKER")
+    print("=" * 60 + "\n")
+    
+    report = run(project_path)
+    
+    if not report['results']:
         print("[!] No TypeScript or Python files found.")
         sys.exit(0)
     
     # Print results
-    critical_issues = 0
-    for result in results:
+    for result in report['results']:
         print(f"\n[{result['type'].upper()}]")
         print("-" * 40)
         for item in result['passed']:
             print(f"  {item}")
         for item in result['issues']:
             print(f"  {item}")
-            if item.startswith("[X]"):
-                critical_issues += 1
     
+    critical_issues = report['critical_issues']
     print("\n" + "=" * 60)
     if critical_issues == 0:
         print("[OK] TYPE COVERAGE: ACCEPTABLE")
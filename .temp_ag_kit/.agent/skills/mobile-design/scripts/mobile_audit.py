@@ -72,16 +72,21 @@ import json
 from pathlib import Path
 
 class MobileAuditor:
-    def __init__(self):
+    def __init__(self, index=None, memo=None):
         self.issues = []
         self.warnings = []
         self.passed_count = 0
         self.files_checked = 0
+        self.index = index  # shared project index (checklist/verify_all), optional
+        self.memo = memo    # per-file results cache (checklist/verify_all), optional
 
     def audit_file(self, filepath: str) -> None:
         try:
-            with open(filepath, 'r', encoding='utf-8', errors='replace') as f:
-                content = f.read()
+            if self.index:
+                content = self.index.read_text(filepath, errors='replace')
+            else:
+                with open(filepath, 'r', encoding='utf-8', errors='replace') as f:
+                    content = f.read()
         except:
             return
 
@@ -612,11 +617,37 @@ class MobileAuditor:
 
     def audit_directory(self, directory: str) -> None:
         extensions = {'.tsx', '.ts', '.jsx', '.js', '.dart'}
-        for root, dirs, files in os.walk(directory):
-            dirs[:] = [d for d in dirs if d not in {'node_modules', '.git', 'dist', 'build', '.next', 'ios', 'android', 'build', '.idea'}]
+        skip_dirs = {'node_modules', '.git', 'dist', 'build', '.next', 'ios', 'android', 'build', '.idea'}
+        if self.index:
+            walk = self.index.walk(skip_dirs)
+        else:
+            walk = self._walk(directory, skip_dirs)
+        for root, files in walk:
             for file in files:
                 if Path(file).suffix in extensions:
-                    self.audit_file(os.path.join(root, file))
+                    if self.memo is not None:
+                        self._merge(self.memo.call(self._audit_one, os.path.join(root, file)))
+                    else:
+                        self.audit_file(os.path.join(root, file))
+
+    def _audit_one(self, filepath: str) -> list:
+        """Findings for a single file, from a fresh auditor (cached per file)"""
+        auditor = MobileAuditor(self.index)
+        auditor.audit_file(filepath)
+        return [auditor.issues, auditor.warnings, auditor.passed_count, auditor.files_checked]
+
+    def _merge(self, findings: list) -> None:
+        issues, warnings, passed_count, files_checked = findings
+        self.issues.extend(issues)
+        self.warnings.extend(warnings)
+        self.passed_count += passed_count
+        self.files_checked += files_checked
+
+    @staticmethod
+    def _walk(directory: str, skip_dirs: set):
+        for root, dirs, files in os.walk(directory):
+            dirs[:] = [d for d in dirs if d not in skip_dirs]
+            yield root, files
 
     def get_report(self):
         return {
@@ -628,6 +659,22 @@ class MobileAuditor:
         }
 
 
+def run(project_path, context: dict = None) -> dict:
+    """
+    In-process entry point used by checklist.py / verify_all.py.
+    Returns get_report() plus "passed", without printing.
+    """
+    auditor = MobileAuditor((context or {}).get("index"), (context or {}).get("memo"))
+    if os.path.isfile(project_path):
+        auditor.audit_file(project_path)
+    else:
+        auditor.audit_directory(project_path)
+    
+    report = auditor.get_report()
+    report["passed"] = report["compliant"]
+    return report
+
+
 def main():
     if len(sys.argv) < 2:
         print("Usage: python mobile_audit.py <directory>")
@@ -636,13 +683,7 @@ def main():
     path = sys.argv[1]
     is_json = "--json" in sys.argv
 
-    auditor = MobileAuditor()
-    if os.path.isfile(path):
-        auditor.audit_file(path)
-    else:
-        auditor.audit_directory(path)
-
-    report = auditor.get_report()
+    report = run(path)
 
     if is_json:
         print(json.dumps(report, indent=2))
@@ -665,6 +706,4 @@ def main():
 
 
 if __name__ == "__main__":
-    # Fix missing import
-    import re
     main()
@@ -75,13 +75,14 @@ def is_page_file(file_path: Path) -> bool:
     return False
 
 
-def find_pages(project_path: Path) -> list:
-    """Find page files to check."""
+def find_pages(project_path: Path, index=None) -> list:
+    """Find page files to check (from the shared project index if given)."""
     patterns = ['**/*.html', '**/*.htm', '**/*.jsx', '**/*.tsx']
     
     files = []
     for pattern in patterns:
-        for f in project_path.glob(pattern):
+        candidates = index.files(Path(pattern).suffix) if index else project_path.glob(pattern)
+        for f in candidates:
             # Skip excluded directories
             if any(skip in f.parts for skip in SKIP_DIRS):
                 continue
@@ -93,12 +94,15 @@ def find_pages(project_path: Path) -> list:
     return files[:50]  # Limit to 50 files
 
 
-def check_page(file_path: Path) -> dict:
+def check_page(file_path: Path, index=None) -> dict:
     """Check a single page for SEO issues."""
     issues = []
     
     try:
-        content = file_path.read_text(encoding='utf-8', errors='ignore')
+        if index:
+            content = index.read_text(file_path)
+        else:
+            content = file_path.read_text(encoding='utf-8', errors='ignore')
     except Exception as e:
         return {"file": str(file_path.name), "issues": [f"Error: {e}"]}
     
@@ -145,6 +149,46 @@ def check_page(file_path: Path) -> dict:
     }
 
 
+def run(project_path, context: dict = None) -> dict:
+    """
+    In-process entry point used by checklist.py / verify_all.py.
+    Returns the same report main() prints, without printing; each issue
+    is also sent to context["emit"] as a finding event.
+    """
+    project_path = Path(project_path).resolve()
+    index = (context or {}).get("index")
+    memo = (context or {}).get("memo")
+    emit = (context or {}).get("emit")
+    pages = find_pages(project_path, index)
+    
+    if not pages:
+        return {"script": "seo_checker", "files_checked": 0, "passed": True}
+    
+    # Check each page
+    all_issues = []
+    for f in pages:
+        result = memo.call(check_page, f, index) if memo else check_page(f, index)
+        if result["issues"]:
+            all_issues.append(result)
+            if emit:
+                for issue in result["issues"]:
+                    emit({"event": "finding", "severity": "medium", "message": issue,
+                          "file": str(f.relative_to(project_path))})
+    
+    total_issues = sum(len(item["issues"]) for item in all_issues)
+    passed = total_issues == 0
+    
+    return {
+        "script": "seo_checker",
+        "project": str(project_path),
+        "files_checked": len(pages),
+        "files_with_issues": len(all_issues),
+        "issues_found": total_issues,
+        "passed": passed,
+        "issues": all_issues
+    }
+
+
 def main():
     project_path = Path(sys.argv[1] if len(sys.argv) > 1 else ".").resolve()
     
@@ -155,30 +199,22 @@ def main():
     print(f"Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print("-"*60)
     
-    # Find pages
-    pages = find_pages(project_path)
+    output = run(project_path)
     
-    if not pages:
+    if not output["files_checked"]:
         print("\n[!] No page files found.")
         print("    Looking for: HTML, JSX, TSX in pages/app/routes directories")
-        output = {"script": "seo_checker", "files_checked": 0, "passed": True}
         print("\n" + json.dumps(output, indent=2))
         sys.exit(0)
     
-    print(f"Found {len(pages)} page files to analyze\n")
-    
-    # Check each page
-    all_issues = []
-    for f in pages:
-        result = check_page(f)
-        if result["issues"]:
-            all_issues.append(result)
+    print(f"Found {output['files_checked']} page files to analyze\n")
     
     # Summary
     print("=" * 60)
     print("SEO ANALYSIS RESULTS")
     print("=" * 60)
     
+    all_issues = output.pop("issues")
     if all_issues:
         # Group by issue type
         issue_counts = {}
@@ -198,21 +234,9 @@ def main():
     else:
         print("\n[OK] No SEO issues found!")
     
-    total_issues = sum(len(item["issues"]) for item in all_issues)
-    passed = total_issues == 0
-    
-    output = {
-        "script": "seo_checker",
-        "project": str(project_path),
-        "files_checked": len(pages),
-        "files_with_issues": len(all_issues),
-        "issues_found": total_issues,
-        "passed": passed
-    }
-    
     print("\n" + json.dumps(output, indent=2))
     
-    sys.exit(0 if passed else 1)
+    sys.exit(0 if output["passed"] else 1)
 
 
 if __name__ == "__main__":
@@ -3,23 +3,35 @@
 Skill: vulnerability-scanner
 Script: security_scan.py
 Purpose: Validate that security principles from SKILL.md are applied correctly
-Usage: python security_scan.py <project_path> [--scan-type all|deps|secrets|patterns|config]
+Usage: python security_scan.py <project_path> [--scan-type all|deps|secrets|patterns|config] [--workers N] [--max-file-size MB] [--history [REF]] [--advisories PATH] [--findings-jsonl FILE] [--no-cache]
 Output: JSON with validation findings
 
 This script verifies:
 1. Dependencies - Supply chain security (OWASP A03)
-2. Secrets - No hardcoded credentials (OWASP A04)
+2. Secrets - No hardcoded credentials, named or high-entropy (OWASP A04)
 3. Code Patterns - Dangerous patterns identified (OWASP A05)
 4. Configuration - Security settings validated (OWASP A02)
 """
 import subprocess
+import hashlib
 import json
 import os
 import sys
 import re
 import argparse
+import heapq
+import math
+import io
+import threading
+import zipfile
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from itertools import accumulate
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 from datetime import datetime
 
 # Fix Windows console encoding for Unicode output
@@ -85,19 +97,556 @@ DANGEROUS_PATTERNS = [
     (r'yaml\.load\s*\([^)]*\)(?!\s*,\s*Loader)', "Unsafe YAML load", "high", "Deserialization risk"),
 ]
 
+# Text each pattern above cannot match without (any one of, case-insensitive),
+# by name. Keep in step with the patterns: a wrong literal hides findings.
+PATTERN_LITERALS = {
+    "API Key": ["api"],
+    "Token": ["token"],
+    "Bearer Token": ["bearer"],
+    "AWS Access Key": ["akia"],
+    "AWS Secret": ["aws"],
+    "Azure Credential": ["azure"],
+    "GCP Credential": ["google"],
+    "Password": ["password"],
+    "Database Connection String": ["://"],
+    "Private Key": ["-----begin"],
+    "SSH Key": ["ssh-rsa"],
+    "JWT Token": ["eyj"],
+    "eval() usage": ["eval"],
+    "exec() usage": ["exec"],
+    "Function constructor": ["function"],
+    "child_process.exec": ["child_process.exec"],
+    "subprocess with shell=True": ["subprocess.call"],
+    "dangerouslySetInnerHTML": ["dangerouslysetinnerhtml"],
+    "innerHTML assignment": [".innerhtml"],
+    "document.write": ["document.write"],
+    "SQL String Concat": ["select", "insert", "update", "delete"],
+    "SQL f-string": ["select", "insert", "update", "delete"],
+    "SSL Verify Disabled": ["verify"],
+    "Insecure flag": ["--insecure"],
+    "SSL Disabled": ["disable"],
+    "pickle usage": ["pickle."],
+    "Unsafe YAML load": ["yaml.load"],
+}
+
+# High-entropy strings: random-looking tokens no SECRET_PATTERNS name gives away. Candidates
+# are values (after a quote, =, : or backtick) made of base64/hex characters only; those
+# passing the character-mix checks get their Shannon entropy (bits per character) measured.
+ENTROPY_CANDIDATE = re.compile(r'["\'=:`] ?([A-Za-z0-9+/_-]{20,}={0,2})')
+BASE64_ENTROPY = 4.2
+HEX_MIN_LENGTH = 32
+HEX_ENTROPY = 3.0
+
+# Hashes that are meant to be there: lockfiles are not searched for high-entropy strings,
+# nor is any value following one of these words on its line (integrity fields and the like)
+LOCKFILES = {'package-lock.json', 'npm-shrinkwrap.json', 'yarn.lock', 'pnpm-lock.yaml', 'bun.lock',
+             'poetry.lock', 'Pipfile.lock', 'composer.lock', 'Gemfile.lock', 'Cargo.lock', 'go.sum'}
+ENTROPY_ALLOW_CONTEXT = re.compile(r'integrity|checksum|shasum|sha\d*|md5|hash|digest|resolved', re.IGNORECASE)
+
 SKIP_DIRS = {'node_modules', '.git', 'dist', 'build', '__pycache__', '.venv', 'venv', '.next'}
 CODE_EXTENSIONS = {'.js', '.ts', '.jsx', '.tsx', '.py', '.go', '.java', '.rb', '.php'}
 CONFIG_EXTENSIONS = {'.json', '.yaml', '.yml', '.toml', '.env', '.env.local', '.env.development'}
+CONFIG_FILES = {'next.config.js', 'webpack.config.js', '.eslintrc.js'}
+HEADER_FILES = ["next.config.js", "next.config.mjs", "middleware.ts", "nginx.conf"]
+
+CONFIG_ISSUES = [
+    (r'"DEBUG"\s*:\s*true', "Debug mode enabled", "high"),
+    (r'debug\s*=\s*True', "Debug mode enabled", "high"),
+    (r'NODE_ENV.*development', "Development mode in config", "medium"),
+    (r'"CORS_ALLOW_ALL".*true', "CORS allow all origins", "high"),
+    (r'"Access-Control-Allow-Origin".*\*', "CORS wildcard", "high"),
+    (r'allowCredentials.*true.*origin.*\*', "Dangerous CORS combo", "critical"),
+]
+
+# Findings by severity, most severe first. Reports list a scan's most severe findings (up to
+# each scanner's KEEP, ties in walk order); every finding is counted and goes to the sinks
+# (events, --findings-jsonl)
+SEVERITY_RANK = {"critical": 0, "high": 1, "medium": 2, "moderate": 2, "low": 3, "info": 4}
+
+# Parallel scans (--workers): files per chunk sent to a worker, and the fewest files worth a pool
+CHUNK_FILES = 64
+PARALLEL_MIN_FILES = 200
+
+# Large files: streamed from this size on, in chunks of CHUNK_CHARS whole lines plus
+# OVERLAP_CHARS read ahead (a match starting in a chunk is seen whole if not longer);
+# above MAX_FILE_SIZE (--max-file-size) not scanned at all, reported as too large
+STREAM_MIN_SIZE = 1024 * 1024
+CHUNK_CHARS = 1024 * 1024
+OVERLAP_CHARS = 64 * 1024
+MAX_FILE_SIZE = 20 * 1024 * 1024
+
+# A NUL byte in the first BINARY_SNIFF_BYTES makes a file binary (skipped). Code whose
+# lines average over MINIFIED_LINE_CHARS in that sample, or named *.min.*, is minified:
+# searched for secrets but not for code patterns (a bundle's one-line body is just noise,
+# and slow to match line patterns against)
+BINARY_SNIFF_BYTES = 8192
+MINIFIED_LINE_CHARS = 500
+
+# --history: blob reads queued ahead of the scanner in git cat-file's pipe
+HISTORY_PIPE_BUFFER = 1024 * 1024
+
+# Offline dependency audit (--advisories): lockfile -> OSV ecosystem of its packages,
+# and OSV / GitHub advisory severities -> finding severities
+LOCKFILE_ECOSYSTEMS = {"package-lock.json": "npm", "npm-shrinkwrap.json": "npm",
+                       "pnpm-lock.yaml": "npm", "poetry.lock": "PyPI"}
+ADVISORY_SEVERITIES = {"critical": "critical", "high": "high", "moderate": "medium", "medium": "medium",
+                       "low": "low"}
+
+
+# ============================================================================
+#  PATTERN ENGINE
+# ============================================================================
+
+# Characters re.IGNORECASE matches to an ASCII letter that str.lower() leaves alone
+# (or, for the dotted capital I, turns into two characters)
+_FOLD = str.maketrans({"\u0130": "i", "\u0131": "i", "\u017f": "s"})
+
+
+def _fold(text: str) -> str:
+    """text lowercased the way re.IGNORECASE compares ASCII letters; lines stay put"""
+    if text.isascii():
+        return text.lower()
+    return text.translate(_FOLD).lower()
+
+
+class PatternSet:
+    """
+    Patterns compiled once, behind a literal prefilter.
+
+    Every pattern needs one of its literals. Plain substring searches over
+    the lowercased text find which literals occur, and on which lines; only
+    those patterns run in full, and line patterns only on those lines, in
+    place (pos/endpos into the text). (One combined alternation is a single
+    pass too, but the re module walks it position by position: ten times
+    slower than the substring searches. So is running a line pattern over
+    the whole text, about twice as slow as over its lines.)
+    """
+
+    def __init__(self, patterns: list, literals: Dict[str, List[str]]):
+        self.patterns = [(re.compile(pattern, re.IGNORECASE), *rest) for pattern, *rest in patterns]
+        self._needs = {}  # literal -> indexes of the patterns needing it
+        for i, (_, name, *_) in enumerate(patterns):
+            for literal in literals[name]:
+                self._needs.setdefault(literal.lower(), set()).add(i)
+
+    def candidates(self, text: str) -> List[int]:
+        """Indexes of the patterns that may match somewhere in text"""
+        folded = _fold(text)
+        return sorted(set().union(*(found for literal, found in self._needs.items() if literal in folded)))
+
+    def candidate_lines(self, text: str) -> List[tuple]:
+        """(start, stop, pattern indexes) of the lines that may match, in order; stop is past the newline"""
+        folded = _fold(text)  # same offsets as text
+        hits = {}  # line start -> [stop, pattern indexes]
+        for literal, found in self._needs.items():
+            pos = folded.find(literal)
+            while pos != -1:
+                start = text.rfind("\n", 0, pos) + 1
+                stop = text.find("\n", pos) + 1 or len(text)
+                hits.setdefault(start, [stop, set()])[1].update(found)
+                pos = folded.find(literal, stop)
+        return [(start, stop, sorted(found)) for start, (stop, found) in sorted(hits.items())]
+
+
+SECRETS = PatternSet(SECRET_PATTERNS, PATTERN_LITERALS)
+CODE_PATTERNS = PatternSet(DANGEROUS_PATTERNS, PATTERN_LITERALS)
 
 
 # ============================================================================
 #  SCANNING FUNCTIONS
 # ============================================================================
 
-def scan_dependencies(project_path: str) -> Dict[str, Any]:
+_DIGITS = set("0123456789")
+_UPPER = set("ABCDEFGHIJKLMNOPQRSTUVWXYZ")
+_LOWER = set("abcdefghijklmnopqrstuvwxyz")
+_HEX = set("0123456789abcdefABCDEF")
+
+
+def _shannon(text: str) -> float:
+    n = len(text)
+    return -sum(count / n * math.log2(count / n) for count in Counter(text).values())
+
+
+def _high_entropy(token: str) -> bool:
+    """A random-looking hex or base64 token; cheap set checks first, entropy last"""
+    token = token.rstrip("=")
+    chars = set(token)
+    if chars <= _HEX:
+        return len(token) >= HEX_MIN_LENGTH and not chars <= _DIGITS and _shannon(token) >= HEX_ENTROPY
+    if not (chars & _DIGITS and chars & _UPPER and chars & _LOWER) or token.startswith("/"):
+        return False
+    if "0123" in token or "abcd" in token or "ABCD" in token:
+        return False  # an alphabet spelled out, not a key
+    return _shannon(token) >= BASE64_ENTROPY
+
+
+def _walk(project_path: str, index=None):
+    """Yield (dir, files) outside SKIP_DIRS, from the shared project index if given"""
+    if index:
+        yield from index.walk(SKIP_DIRS)
+        return
+    for root, dirs, files in os.walk(project_path):
+        dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+        yield root, files
+
+
+def _read_chunks(filepath: Path):
+    """_text_chunks() over a large file"""
+    with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
+        yield from _text_chunks(f)
+
+
+def _text_chunks(f):
+    """
+    Yield (text, end, first line) over a text stream, memory bounded: text is whole
+    lines from where the previous chunk's end was, then read-ahead; scanners count
+    only what starts before end. Universal newlines, like open().
+    """
+    text, line, eof = "", 1, False
+    while True:
+        while not eof and len(text) < CHUNK_CHARS + OVERLAP_CHARS:
+            data = f.read(CHUNK_CHARS)
+            eof = not data
+            text += data
+        if eof:
+            yield text, len(text), line
+            return
+        # A line longer than a chunk is cut; its remainder reads as a line of its own
+        end = text.rfind("\n", 0, CHUNK_CHARS) + 1 or CHUNK_CHARS
+        yield text, end, line
+        line += text.count("\n", 0, end)
+        text = text[end:]
+
+
+class _LineIndex:
+    """
+    Offsets in a text -> line and column, by bisecting where its lines start.
+    Built on first use: most texts have nothing to place.
+    """
+
+    def __init__(self, text: str, first_line: int = 1):
+        self.text = text
+        self.first_line = first_line
+        self._starts = None
+
+    def locate(self, offset: int):
+        """(line, column) of offset, both from 1"""
+        if self._starts is None:
+            # Line lengths + 1, summed up (all C loops)
+            self._starts = [0, *accumulate(map((1).__add__, map(len, self.text.split("\n"))))]
+        i = bisect_right(self._starts, offset) - 1
+        return self.first_line + i, offset - self._starts[i] + 1
+
+
+def _looks_minified(relpath: str, sample: str) -> bool:
+    if ".min." in os.path.basename(relpath):
+        return True
+    return len(sample) > MINIFIED_LINE_CHARS and len(sample) / (sample.count("\n") + 1) > MINIFIED_LINE_CHARS
+
+
+def _too_large(relpath: str, size: int, limit: int) -> Dict[str, Any]:
+    """The finding for a file over the size limit, in each scanner's shape"""
+    return {
+        "file": relpath,
+        "severity": "info",
+        "message": f"skipped: too large ({size / 1024 / 1024:.1f} MB, limit {limit / 1024 / 1024:g} MB)"
+    }
+
+
+def _raw(results: Dict[str, Any]) -> Dict[str, Any]:
+    """A scanner's results for one file, minus the fixed fields and zero counts: what is cached / sent back"""
+    raw = {}
+    for key, value in results.items():
+        if isinstance(value, dict):
+            value = {name: count for name, count in value.items() if count}
+        if value and not isinstance(value, str):
+            raw[key] = value
+    return raw
+
+
+class Findings:
+    """
+    A scan's findings, for any number of them in bounded memory: each is passed
+    to sink as it comes and counted by severity, and only the `keep` most
+    severe (first come first) are held, in a heap whose top is the one to drop
+    next. keep None holds them all. saved restores what to_json() gave.
+    """
+
+    def __init__(self, keep: Optional[int] = None, sink=None, saved: Optional[dict] = None):
+        self.keep = keep
+        self.sink = sink
+        self.counts = {}  # severity -> findings
+        self._heap = []   # (-severity rank, -arrival, finding)
+        self._arrivals = 0
+        for finding in (saved or {}).get("top", []):
+            self._hold(finding)
+        if saved:
+            self.counts = dict(saved.get("counts", {}))
+
+    def __len__(self) -> int:
+        return sum(self.counts.values())
+
+    def append(self, finding: Dict[str, Any]):
+        severity = finding.get("severity", "info")
+        self.counts[severity] = self.counts.get(severity, 0) + 1
+        if self.sink:
+            self.sink(finding)
+        self._hold(finding)
+
+    def extend(self, findings):
+        for finding in findings:
+            self.append(finding)
+
+    def _hold(self, finding: Dict[str, Any]):
+        item = (-SEVERITY_RANK.get(finding.get("severity"), len(SEVERITY_RANK)), -self._arrivals, finding)
+        self._arrivals += 1
+        if self.keep is None or len(self._heap) < self.keep:
+            heapq.heappush(self._heap, item)
+        elif item[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, item)
+
+    def top(self) -> List[Dict[str, Any]]:
+        """The findings held, most severe first"""
+        return [finding for _, _, finding in sorted(self._heap, key=lambda item: (-item[0], -item[1]))]
+
+    def to_json(self) -> dict:
+        return {"top": self.top(), "counts": self.counts}
+
+
+def _report_findings(results: Dict[str, Any], keep: Optional[int]) -> Dict[str, int]:
+    """Replace results' findings with the ones to report, add their counts by severity, return them"""
+    findings = results["findings"]
+    if not isinstance(findings, Findings):
+        findings = Findings(keep)
+        findings.extend(results["findings"])
+    results["findings"] = findings.top()
+    results["finding_counts"] = findings.counts
+    return findings.counts
+
+
+def _merge_results(results: Dict[str, Any], part: Dict[str, Any]):
+    """Fold one file's raw scanner results (findings, counters) into the totals"""
+    for key, value in part.items():
+        if isinstance(value, list):
+            results[key].extend(value)
+        elif isinstance(value, int):
+            results[key] += value
+        elif isinstance(value, dict):
+            for name, count in value.items():
+                results[key][name] = results[key].get(name, 0) + count
+
+
+def _scan_one(filepath: Path, classes: list, relpath: str, index=None,
+              max_size: int = MAX_FILE_SIZE) -> List[Dict[str, Any]]:
+    """
+    Raw results of fresh scanners over one file: read whole (from the shared index
+    if given), streamed in chunks if large, or skipped if binary or over max_size.
+    An unreadable file counts as scanned, with no findings.
+    """
+    scanners = [cls() for cls in classes]
+    for scanner in scanners:
+        scanner.start(relpath)
+    binary = False
+    try:
+        size = os.path.getsize(filepath)
+        if size > max_size:
+            for scanner in scanners:
+                scanner.skip("too_large", _too_large(relpath, size, max_size))
+        elif size >= STREAM_MIN_SIZE:
+            with open(filepath, 'rb') as f:
+                binary = b"\0" in f.read(BINARY_SNIFF_BYTES)
+            for text, end, line in ([] if binary else _read_chunks(filepath)):
+                for scanner in scanners:
+                    scanner.scan(text, end, line)
+        else:
+            data = index.read_bytes(filepath) if index else Path(filepath).read_bytes()
+            binary = b"\0" in data[:BINARY_SNIFF_BYTES]
+            if not binary:
+                text = data.decode('utf-8', 'ignore').replace('\r\n', '\n').replace('\r', '\n')
+                for scanner in scanners:
+                    scanner.scan(text)
+        if binary:
+            for scanner in scanners:
+                scanner.skip("binary")
+    except Exception:
+        pass
+    for scanner in scanners:
+        scanner.end()
+    return [_raw(scanner.results) for scanner in scanners]
+
+
+def _scan_chunk(classes: list, max_size: int, chunk: list) -> list:
+    """Worker side of a parallel scan: raw results for each file of one batch"""
+    return [_scan_one(filepath, [classes[i] for i in wanted], relpath, max_size=max_size)
+            for filepath, relpath, wanted in chunk]
+
+
+def _scan_parallel(pool, tasks: list, classes: list, workers: int, max_size: int = MAX_FILE_SIZE):
+    """
+    Yield raw results for each task, in order, from a process pool working through
+    walk-order chunks; each worker compiles the patterns once, at import.
+    """
+    size = max(1, min(CHUNK_FILES, -(-len(tasks) // (workers * 4))))
+    chunks = [tasks[i:i + size] for i in range(0, len(tasks), size)]
+    for part in pool.map(partial(_scan_chunk, classes, max_size), chunks):
+        yield from part
+
+
+def _scan_files(project_path: str, scanners: list, index=None, workers: int = 1, memo=None,
+                max_size: int = MAX_FILE_SIZE, sinks: Optional[list] = None) -> List[Dict[str, Any]]:
+    """
+    Walk the project once, reading each file once for every scanner that wants it,
+    over a pool of worker processes if workers > 1. memo (a ScanCache, or the
+    orchestrators' FileMemo) serves unchanged files from earlier runs. Files
+    over max_size bytes are reported, not scanned.
+    Per-file results are merged in walk order as they come, so the outcome never
+    depends on workers or cache; findings go to the scanners' Findings (sinks:
+    one callable or None per scanner). Returns the scanners' results, in order.
+    """
+    for scanner, sink in zip(scanners, sinks or [None] * len(scanners)):
+        scanner.results["findings"] = Findings(scanner.KEEP, sink)
+    tasks = []  # (path, relative path, indexes of the scanners wanting the file)
+    for root, files in _walk(project_path, index):
+        for file in files:
+            ext = Path(file).suffix.lower()
+            wanted = tuple(i for i, scanner in enumerate(scanners) if scanner.wants(file, ext))
+            if wanted:
+                filepath = Path(root) / file
+                tasks.append((filepath, str(filepath.relative_to(project_path)), wanted))
+    classes = [type(scanner) for scanner in scanners]
+    
+    hits = {}  # task number -> raw results from memo
+    keys = {}  # task number -> (relative path, digest) to store under
+    if memo is not None:
+        for n, (filepath, _, _) in enumerate(tasks):
+            rel, digest, entry = memo.lookup(filepath)
+            if entry:
+                hits[n] = entry[1]
+            else:
+                keys[n] = (rel, digest)
+    misses = [n for n in range(len(tasks)) if n not in hits]
+    
+    pool = None
+    fresh = iter(())  # raw results of the misses, in order, while a pool provides them
+    if workers > 1 and len(misses) >= PARALLEL_MIN_FILES:
+        try:
+            pool = ProcessPoolExecutor(max_workers=workers)
+            fresh = _scan_parallel(pool, [tasks[n] for n in misses], classes, workers, max_size)
+        except OSError:
+            pass  # no usable pool here: the misses are scanned serially
+    try:
+        for n, (filepath, relpath, wanted) in enumerate(tasks):
+            raws = hits.get(n)
+            if raws is None:
+                try:
+                    raws = next(fresh, None)
+                except (OSError, BrokenProcessPool):
+                    fresh = iter(())  # the pool broke: scan the rest serially
+                if raws is None:
+                    raws = _scan_one(filepath, [classes[i] for i in wanted], relpath, index, max_size)
+                if n in keys:
+                    memo.store(*keys[n], raws)
+            for i, raw in zip(wanted, raws):
+                _merge_results(scanners[i].results, raw)
+    finally:
+        if pool:
+            pool.shutdown(cancel_futures=True)
+    return [scanner.finish(project_path) for scanner in scanners]
+
+
+def _cache_file(root: Path, name: str) -> Path:
+    """Where this project's `name` data is kept: next to the orchestrators' cache"""
+    base = os.environ.get("AG_KIT_CACHE_DIR") or os.path.join(
+        os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+        "antigravity-kit", "verify")
+    key = hashlib.sha1(str(root).encode("utf-8")).hexdigest()[:16]
+    return Path(base) / f"{key}.{name}.json"
+
+
+def _rules_version(*settings) -> str:
+    """Cached results are only valid for this script (the rules live here) and these settings"""
+    with open(__file__, "rb") as f:
+        return hashlib.sha1(f.read() + repr(settings).encode()).hexdigest()
+
+
+def _load_json(path: Path) -> dict:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_json(path: Path, data: dict):
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+
+class ScanCache:
+    """
+    Per-file results of the file scanners between standalone runs, like the
+    orchestrators' FileMemo (same lookup/store API): relative path ->
+    [size, mtime, content digest, raw results]. An unchanged size and mtime
+    costs a stat; otherwise the file is hashed and only rescanned if its
+    content changed. Entries are kept for one version of this script (the
+    rules live here), one scan type and one size limit.
+    """
+
+    def __init__(self, project_path: str, scan_type: str = "all", max_size: int = MAX_FILE_SIZE):
+        self.root = Path(project_path).resolve()
+        self.path = _cache_file(self.root, f"security-{scan_type}")
+        self.version = _rules_version(max_size)
+        data = _load_json(self.path)
+        self._old = data.get("files", {}) if data.get("version") == self.version else {}
+        self.entries = {}  # entries used or produced this run; the rest are dropped on save
+        self.hits = 0
+
+    def lookup(self, path):
+        """(relative path, digest key, cached [digest, raw results] or None)"""
+        rel = os.path.relpath(os.path.abspath(path), self.root)
+        try:
+            st = os.stat(path)
+        except OSError:
+            return rel, None, None
+        old = self._old.get(rel)
+        if old and old[0] == st.st_size and old[1] == st.st_mtime_ns:
+            digest = old[2]
+        else:
+            try:
+                h = hashlib.sha1()
+                with open(path, "rb") as f:
+                    for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                        h.update(chunk)
+                digest = h.hexdigest()
+            except OSError:
+                return rel, None, None
+        key = (st.st_size, st.st_mtime_ns, digest)
+        if not old or old[2] != digest:
+            return rel, key, None
+        self.hits += 1
+        self.entries[rel] = [*key, old[3]]
+        return rel, key, [digest, old[3]]
+
+    def store(self, rel: str, key, value):
+        if key is not None:
+            self.entries[rel] = [*key, value]
+
+    def save(self):
+        _save_json(self.path, {"version": self.version, "project": str(self.root), "files": self.entries})
+
+
+def scan_dependencies(project_path: str, index=None, advisories=None) -> Dict[str, Any]:
     """
     Validate supply chain security (OWASP A03).
     Checks: npm audit, lock file presence, dependency age.
+    With advisories (a local OSV snapshot), lockfiles are audited offline
+    against it instead of running npm audit.
     """
     results = {"tool": "dependency_scanner", "findings": [], "status": "[OK] Secure"}
     
@@ -128,8 +677,17 @@ def scan_dependencies(project_path: str) -> Dict[str, Any]:
                     "message": f"{manager}: No lock file found. Supply chain integrity at risk."
                 })
     
+    if advisories:
+        audit = audit_lockfiles(project_path, advisories)
+        results["findings"].extend(audit["findings"])
+        results["offline_audit"] = {"packages": audit["packages"], **audit["severity_count"]}
+        if audit["severity_count"]["critical"]:
+            results["status"] = "[!!] Critical vulnerabilities"
+        elif audit["severity_count"]["high"]:
+            results["status"] = "[!] High vulnerabilities"
+    
     # Run npm audit if applicable
-    if (Path(project_path) / "package.json").exists():
+    elif (Path(project_path) / "package.json").exists():
         try:
             result = subprocess.run(
                 ["npm", "audit", "--json"],
@@ -178,199 +736,779 @@ def scan_dependencies(project_path: str) -> Dict[str, Any]:
     return results
 
 
-def scan_secrets(project_path: str) -> Dict[str, Any]:
+class SecretScanner:
+    """
+    Per-file part of scan_secrets(). One instance scans one file: start(), then
+    scan() for the whole text or for each chunk of it, then end(); or skip().
+    """
+
+    KEEP = 15  # findings reported, most severe first
+
+    def __init__(self):
+        self.results = {
+            "tool": "secret_scanner",
+            "findings": [],
+            "status": "[OK] No secrets detected",
+            "scanned_files": 0,
+            "by_severity": {"critical": 0, "high": 0, "medium": 0},
+            "skipped": {}
+        }
+        self.relpath = None
+        self._counts = {}  # pattern index -> matches so far
+        self._first = {}   # pattern index -> (line, column) of its first match
+        self._resume = {}  # pattern index -> offset in the next chunk where its last match ended
+        self._entropy = True
+        self._entropy_count = 0
+        self._entropy_first = None
+        self._entropy_resume = 0
+
+    def wants(self, file: str, ext: str) -> bool:
+        return ext in CODE_EXTENSIONS or ext in CONFIG_EXTENSIONS
+
+    def start(self, relpath: str):
+        self.relpath = relpath
+        self.results["scanned_files"] += 1
+        self._entropy = os.path.basename(relpath) not in LOCKFILES
+
+    def skip(self, reason: str, finding: Optional[Dict[str, Any]] = None):
+        self.results["skipped"][reason] = self.results["skipped"].get(reason, 0) + 1
+        if finding:
+            self.results["findings"].append({"file": finding["file"], "type": "File too large", **finding})
+
+    def scan(self, content: str, end: Optional[int] = None, line: int = 1):
+        """Matches starting before end (default: all of content) count; the rest is read-ahead"""
+        end = len(content) if end is None else end
+        lines = _LineIndex(content, line)
+        resume = {}
+        spans = []  # where the named patterns matched
+        for i in SECRETS.candidates(content):
+            pattern = SECRETS.patterns[i][0]
+            last = self._resume.get(i, 0)
+            for m in pattern.finditer(content, last):
+                if m.start() >= end:
+                    break
+                if i not in self._counts:
+                    self._first[i] = lines.locate(m.start())
+                self._counts[i] = self._counts.get(i, 0) + 1
+                spans.append(m.span())
+                last = m.end()
+            resume[i] = max(0, last - end)
+        self._resume = resume
+        if self._entropy:
+            self._scan_entropy(content, end, spans, lines)
+
+    def _scan_entropy(self, content: str, end: int, spans: list, lines: _LineIndex):
+        """Count high-entropy values not already matched by a named pattern"""
+        spans.sort()
+        starts = [start for start, _ in spans]
+        reach = []  # furthest end among the spans so far
+        for _, stop in spans:
+            reach.append(max(stop, reach[-1]) if reach else stop)
+        last = self._entropy_resume
+        for m in ENTROPY_CANDIDATE.finditer(content, last):
+            if m.start() >= end:
+                break
+            last = m.end()
+            start, stop = m.span(1)
+            if not _high_entropy(m.group(1)):
+                continue
+            named = bisect_left(starts, stop)
+            if named and reach[named - 1] > start:
+                continue
+            if ENTROPY_ALLOW_CONTEXT.search(content, content.rfind("\n", 0, start) + 1, start):
+                continue
+            if not self._entropy_count:
+                self._entropy_first = lines.locate(start)
+            self._entropy_count += 1
+        self._entropy_resume = max(0, last - end)
+
+    def end(self):
+        for i in sorted(self._counts):
+            _, secret_type, severity = SECRETS.patterns[i]
+            line, column = self._first[i]
+            self.results["findings"].append({
+                "file": self.relpath,
+                "line": line,
+                "column": column,
+                "type": secret_type,
+                "severity": severity,
+                "count": self._counts[i]
+            })
+            self.results["by_severity"][severity] += self._counts[i]
+        if self._entropy_count:
+            line, column = self._entropy_first
+            self.results["findings"].append({
+                "file": self.relpath,
+                "line": line,
+                "column": column,
+                "type": "High Entropy String",
+                "severity": "medium",
+                "count": self._entropy_count
+            })
+            self.results["by_severity"]["medium"] += self._entropy_count
+
+    def finish(self, project_path: str) -> Dict[str, Any]:
+        results = self.results
+        if results["by_severity"]["critical"] > 0:
+            results["status"] = "[!!] CRITICAL: Secrets exposed!"
+        elif results["by_severity"]["high"] > 0:
+            results["status"] = "[!] HIGH: Secrets found"
+        elif sum(results["by_severity"].values()) > 0:
+            results["status"] = "[?] Potential secrets detected"
+        
+        _report_findings(results, self.KEEP)
+        if not results["skipped"]:
+            del results["skipped"]
+        
+        return results
+
+
+class CodePatternScanner:
+    """Per-file part of scan_code_patterns(); same protocol as SecretScanner"""
+
+    KEEP = 20
+
+    def __init__(self):
+        self.results = {
+            "tool": "pattern_scanner",
+            "findings": [],
+            "status": "[OK] No dangerous patterns",
+            "scanned_files": 0,
+            "by_category": {},
+            "skipped": {}
+        }
+        self.relpath = None
+        self._minified = None
+
+    def wants(self, file: str, ext: str) -> bool:
+        return ext in CODE_EXTENSIONS
+
+    def start(self, relpath: str):
+        self.relpath = relpath
+        self.results["scanned_files"] += 1
+
+    def skip(self, reason: str, finding: Optional[Dict[str, Any]] = None):
+        self.results["skipped"][reason] = self.results["skipped"].get(reason, 0) + 1
+        if finding:
+            self.results["findings"].append({"file": finding["file"], "pattern": "File too large", **finding,
+                                             "category": "Not scanned"})
+
+    def scan(self, content: str, end: Optional[int] = None, line: int = 1):
+        """Lines starting before end (default: all of content) count; the rest is read-ahead"""
+        if self._minified is None:
+            self._minified = _looks_minified(self.relpath, content[:BINARY_SNIFF_BYTES])
+            if self._minified:
+                self.skip("minified")
+        if self._minified:
+            return
+        end = len(content) if end is None else end
+        lines = _LineIndex(content, line)
+        for start, stop, found in CODE_PATTERNS.candidate_lines(content):
+            if start >= end:
+                break
+            for i in found:
+                pattern, name, severity, category = CODE_PATTERNS.patterns[i]
+                m = pattern.search(content, start, stop)
+                if m:
+                    line_num, column = lines.locate(m.start())
+                    self.results["findings"].append({
+                        "file": self.relpath,
+                        "line": line_num,
+                        "column": column,
+                        "pattern": name,
+                        "severity": severity,
+                        "category": category,
+                        "snippet": content[start:stop].strip()[:80]
+                    })
+                    self.results["by_category"][category] = self.results["by_category"].get(category, 0) + 1
+
+    def end(self):
+        pass
+
+    def finish(self, project_path: str) -> Dict[str, Any]:
+        results = self.results
+        counts = _report_findings(results, self.KEEP)
+        
+        if counts.get("critical"):
+            results["status"] = f"[!!] CRITICAL: {counts['critical']} dangerous patterns"
+        elif counts.get("high"):
+            results["status"] = f"[!] HIGH: {counts['high']} risky patterns"
+        elif counts:
+            results["status"] = "[?] Some patterns need review"
+        
+        if not results["skipped"]:
+            del results["skipped"]
+        
+        return results
+
+
+class ConfigScanner:
+    """Per-file part of scan_configuration(); same protocol as SecretScanner"""
+
+    ISSUES = [(re.compile(pattern, re.IGNORECASE), issue, severity) for pattern, issue, severity in CONFIG_ISSUES]
+    KEEP = None  # all
+
+    def __init__(self):
+        self.results = {
+            "tool": "config_scanner",
+            "findings": [],
+            "status": "[OK] Configuration secure",
+            "checks": {}
+        }
+        self.relpath = None
+        self._found = set()  # indexes of the issues found in this file
+
+    def wants(self, file: str, ext: str) -> bool:
+        return ext in CONFIG_EXTENSIONS or file in CONFIG_FILES
+
+    def start(self, relpath: str):
+        self.relpath = relpath
+
+    def skip(self, reason: str, finding: Optional[Dict[str, Any]] = None):
+        if finding:
+            self.results["findings"].append({"file": finding["file"], "issue": "File too large", **finding})
+
+    def scan(self, content: str, end: Optional[int] = None, line: int = 1):
+        for i, (pattern, _, _) in enumerate(self.ISSUES):
+            if i not in self._found and pattern.search(content):
+                self._found.add(i)
+
+    def end(self):
+        for i in sorted(self._found):
+            _, issue, severity = self.ISSUES[i]
+            self.results["findings"].append({
+                "file": self.relpath,
+                "issue": issue,
+                "severity": severity
+            })
+
+    def finish(self, project_path: str) -> Dict[str, Any]:
+        results = self.results
+        
+        # Check for security header configurations
+        for hf in HEADER_FILES:
+            hf_path = Path(project_path) / hf
+            if hf_path.exists():
+                results["checks"]["security_headers_config"] = True
+                break
+        else:
+            results["checks"]["security_headers_config"] = False
+            results["findings"].append({
+                "issue": "No security headers configuration found",
+                "severity": "medium",
+                "recommendation": "Configure CSP, HSTS, X-Frame-Options headers"
+            })
+        
+        counts = _report_findings(results, self.KEEP)
+        if counts.get("critical"):
+            results["status"] = "[!!] CRITICAL: Configuration issues"
+        elif counts.get("high"):
+            results["status"] = "[!] HIGH: Configuration review needed"
+        elif counts:
+            results["status"] = "[?] Minor configuration issues"
+        
+        return results
+
+
+def scan_secrets(project_path: str, index=None) -> Dict[str, Any]:
     """
     Validate no hardcoded secrets (OWASP A04).
     Checks: API keys, tokens, passwords, cloud credentials.
     """
-    results = {
-        "tool": "secret_scanner",
-        "findings": [],
-        "status": "[OK] No secrets detected",
-        "scanned_files": 0,
-        "by_severity": {"critical": 0, "high": 0, "medium": 0}
-    }
-    
-    for root, dirs, files in os.walk(project_path):
-        dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
-        
-        for file in files:
-            ext = Path(file).suffix.lower()
-            if ext not in CODE_EXTENSIONS and ext not in CONFIG_EXTENSIONS:
-                continue
-                
-            filepath = Path(root) / file
-            results["scanned_files"] += 1
-            
-            try:
-                with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
-                    
-                    for pattern, secret_type, severity in SECRET_PATTERNS:
-                        matches = re.findall(pattern, content, re.IGNORECASE)
-                        if matches:
-                            results["findings"].append({
-                                "file": str(filepath.relative_to(project_path)),
-                                "type": secret_type,
-                                "severity": severity,
-                                "count": len(matches)
-                            })
-                            results["by_severity"][severity] += len(matches)
-                            
-            except Exception:
-                pass
-    
-    if results["by_severity"]["critical"] > 0:
-        results["status"] = "[!!] CRITICAL: Secrets exposed!"
-    elif results["by_severity"]["high"] > 0:
-        results["status"] = "[!] HIGH: Secrets found"
-    elif sum(results["by_severity"].values()) > 0:
-        results["status"] = "[?] Potential secrets detected"
-    
-    # Limit findings for output
-    results["findings"] = results["findings"][:15]
-    
-    return results
+    return _scan_files(project_path, [SecretScanner()], index)[0]
 
 
-def scan_code_patterns(project_path: str) -> Dict[str, Any]:
+def scan_code_patterns(project_path: str, index=None) -> Dict[str, Any]:
     """
     Validate dangerous code patterns (OWASP A05).
     Checks: Injection risks, XSS, unsafe deserialization.
     """
-    results = {
-        "tool": "pattern_scanner",
-        "findings": [],
-        "status": "[OK] No dangerous patterns",
-        "scanned_files": 0,
-        "by_category": {}
-    }
+    return _scan_files(project_path, [CodePatternScanner()], index)[0]
+
+
+def scan_configuration(project_path: str, index=None) -> Dict[str, Any]:
+    """
+    Validate security configuration (OWASP A02).
+    Checks: Security headers, CORS, debug modes.
+    """
+    return _scan_files(project_path, [ConfigScanner()], index)[0]
+
+
+# ============================================================================
+#  HISTORY SCAN
+# ============================================================================
+
+class HistoryState:
+    """
+    How far --history got, kept between runs like ScanCache: the commits scanned
+    up to (with all their ancestors), the blobs already scanned, the raw
+    counters so far and the findings to report (Findings.to_json()). Dropped when this script or the size limit changes; with
+    persist=False (--no-cache) neither loaded nor saved.
+    """
+
+    def __init__(self, project_path: str, max_size: int = MAX_FILE_SIZE, persist: bool = True):
+        self.root = Path(project_path).resolve()
+        self.path = _cache_file(self.root, "security-history") if persist else None
+        self.version = _rules_version(max_size)
+        data = _load_json(self.path) if persist else {}
+        if data.get("version") != self.version:
+            data = {}
+        self.tips = data.get("tips", [])
+        self.blobs = set(data.get("blobs", []))
+        self.results = data.get("results", {})
+        self.findings = data.get("findings", {})
+
+    def save(self):
+        if self.path:
+            _save_json(self.path, {"version": self.version, "project": str(self.root), "tips": self.tips,
+                                   "blobs": sorted(self.blobs), "results": self.results,
+                                   "findings": self.findings})
+
+
+class _BlobReader(io.RawIOBase):
+    """One blob of a git cat-file --batch stream, as a file: head (already read), then size more bytes"""
+
+    def __init__(self, stream, head: bytes, size: int):
+        self.stream = stream
+        self.head = head
+        self.remaining = size
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        if self.head:
+            n = min(len(buffer), len(self.head))
+            buffer[:n], self.head = self.head[:n], self.head[n:]
+            return n
+        n = self.stream.readinto(memoryview(buffer)[:min(len(buffer), self.remaining)])
+        self.remaining -= n
+        return n
+
+    def drain(self):
+        """Skip what is left of the blob"""
+        while self.remaining:
+            data = self.stream.read(min(self.remaining, CHUNK_CHARS))
+            if not data:
+                break
+            self.remaining -= len(data)
+
+
+def _git(project_path: str, *args: str) -> Optional[str]:
+    """Output of a git command, or None if it failed (or there is no git)"""
+    try:
+        result = subprocess.run(["git", *args], cwd=project_path, capture_output=True, text=True, timeout=60)
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    return result.stdout.strip() if result.returncode == 0 else None
+
+
+def _nul_fields(stream):
+    """The NUL-separated fields of a byte stream, read in blocks"""
+    rest = b""
+    for data in iter(lambda: stream.read(64 * 1024), b""):
+        *fields, rest = (rest + data).split(b"\0")
+        yield from fields
+    if rest:
+        yield rest
+
+
+def _history_blobs(project_path: str, revs: List[str], seen: set):
+    """
+    (commits, blobs) for the commits in revs, parents before children: each blob
+    the secret scanner wants, not in seen, as (sha, path, index of the first
+    commit adding it). One git log; merges are diffed against every parent, so
+    content that only a merge brought in is not missed.
+    """
+    wants = SecretScanner().wants
+    proc = subprocess.Popen(["git", "log", "--reverse", "--topo-order", "--raw", "-z", "-m", "--no-renames",
+                             "--no-abbrev", "--relative", "--ignore-missing", "--format=%x00%H", *revs, "--"],
+                            cwd=project_path, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    commits, blobs, listed, meta = [], [], set(), None
+    with proc:
+        # Fields: commit hash; then per changed file ":old-mode new-mode old-sha new-sha status", path
+        for field in _nul_fields(proc.stdout):
+            field = field.lstrip(b"\n")
+            if meta is not None:
+                _, mode, _, sha, _ = meta.split()
+                meta = None
+                if not mode.startswith(b"100") or sha in listed or sha.decode() in seen:
+                    continue  # deleted, symlink or submodule; or scanned already
+                path = field.decode("utf-8", "replace")
+                *dirs, file = path.split("/")
+                if not SKIP_DIRS.intersection(dirs) and wants(file, Path(file).suffix.lower()):
+                    listed.add(sha)
+                    blobs.append((sha.decode(), path, len(commits) - 1))
+            elif field.startswith(b":"):
+                meta = field
+            elif field and (not commits or commits[-1] != field.decode()):
+                commits.append(field.decode())  # a merge comes once per parent
+    if proc.returncode != 0:
+        raise OSError(f"git log failed ({proc.returncode})")
+    return commits, blobs
+
+
+def _scan_blob(stream, size: int, relpath: str, max_size: int) -> Dict[str, Any]:
+    """A fresh SecretScanner's raw results for the next blob in stream, read like a file by _scan_one()"""
+    scanner = SecretScanner()
+    scanner.start(relpath)
+    head = stream.read(min(size, BINARY_SNIFF_BYTES))
+    blob = _BlobReader(stream, head, size - len(head))
+    if size > max_size:
+        scanner.skip("too_large", _too_large(relpath, size, max_size))
+    elif b"\0" in head:
+        scanner.skip("binary")
+    elif size >= STREAM_MIN_SIZE:
+        text = io.TextIOWrapper(io.BufferedReader(blob), encoding="utf-8", errors="ignore")
+        for chunk, end, line in _text_chunks(text):
+            scanner.scan(chunk, end, line)
+        text.detach()
+    else:
+        scanner.scan(blob.readall().decode("utf-8", "ignore").replace("\r\n", "\n").replace("\r", "\n"))
+    blob.drain()
+    stream.read(1)  # the newline after each blob
+    scanner.end()
+    return _raw(scanner.results)
+
+
+def scan_history(project_path: str, ref: str = "HEAD", state: Optional[HistoryState] = None,
+                 max_size: int = MAX_FILE_SIZE, sink=None) -> Dict[str, Any]:
+    """
+    Validate no secrets were ever committed (OWASP A04): every commit reachable from ref.
+    Each distinct blob is scanned once, however many commits carry it, streamed through
+    one long-lived git cat-file --batch. With state, the scan resumes after the commits
+    of earlier runs (or where an interrupted one stopped) and keeps their findings;
+    sink gets the findings of this run's blobs as they come.
+    """
+    total = SecretScanner()
+    total.results.update(tool="history_secret_scanner", ref=ref, commits_scanned=0)
+    tip = _git(project_path, "rev-parse", "--verify", "--quiet", f"{ref}^{{commit}}")
+    if tip is None:
+        total.results["status"] = f"[SKIP] Not a git repository, or no commit {ref!r}"
+        del total.results["skipped"]
+        return total.results
     
-    for root, dirs, files in os.walk(project_path):
-        dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
-        
-        for file in files:
-            ext = Path(file).suffix.lower()
-            if ext not in CODE_EXTENSIONS:
-                continue
-                
-            filepath = Path(root) / file
-            results["scanned_files"] += 1
-            
-            try:
-                with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-                    lines = f.readlines()
-                    
-                    for line_num, line in enumerate(lines, 1):
-                        for pattern, name, severity, category in DANGEROUS_PATTERNS:
-                            if re.search(pattern, line, re.IGNORECASE):
-                                results["findings"].append({
-                                    "file": str(filepath.relative_to(project_path)),
-                                    "line": line_num,
-                                    "pattern": name,
-                                    "severity": severity,
-                                    "category": category,
-                                    "snippet": line.strip()[:80]
-                                })
-                                results["by_category"][category] = results["by_category"].get(category, 0) + 1
-                                
-            except Exception:
-                pass
+    state = state or HistoryState(project_path, max_size, persist=False)
+    _merge_results(total.results, state.results)
+    total.results["findings"] = Findings(total.KEEP, sink, state.findings)
+    commits, blobs = _history_blobs(project_path, [tip, *("^" + t for t in state.tips)], state.blobs)
     
-    critical_count = sum(1 for f in results["findings"] if f["severity"] == "critical")
-    high_count = sum(1 for f in results["findings"] if f["severity"] == "high")
+    proc = subprocess.Popen(["git", "cat-file", "--batch", "--buffer"], cwd=project_path, stdin=subprocess.PIPE,
+                            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, bufsize=HISTORY_PIPE_BUFFER)
     
-    if critical_count > 0:
-        results["status"] = f"[!!] CRITICAL: {critical_count} dangerous patterns"
-    elif high_count > 0:
-        results["status"] = f"[!] HIGH: {high_count} risky patterns"
-    elif results["findings"]:
-        results["status"] = "[?] Some patterns need review"
+    def feed():
+        try:
+            for sha, _, _ in blobs:
+                proc.stdin.write(sha.encode() + b"\n")
+            proc.stdin.close()
+        except (OSError, ValueError):
+            pass  # cat-file gone, or the scan stopped
     
-    # Limit findings
-    results["findings"] = results["findings"][:20]
+    threading.Thread(target=feed, daemon=True).start()
+    done = 0  # commits all of whose blobs are scanned: the commits before the current blob's
+    try:
+        for sha, path, commit in blobs:
+            done = commit
+            header = proc.stdout.readline().split()
+            if len(header) == 3 and header[1] == b"blob":
+                raw = _scan_blob(proc.stdout, int(header[2]), path, max_size)
+                for i, finding in enumerate(raw.get("findings", [])):
+                    raw["findings"][i] = {"file": finding["file"], "commit": commits[commit][:12], **finding}
+                _merge_results(total.results, raw)
+            elif not header:
+                raise OSError("git cat-file stopped")
+            state.blobs.add(sha)
+        done = len(commits)
+    finally:
+        proc.kill()
+        proc.wait()
+        proc.stdout.close()
+        total.results["commits_scanned"] += done
+        scanned = commits[done - 1:done] if done < len(commits) else [tip]
+        tips = _git(project_path, "merge-base", "--independent", *state.tips, *scanned)
+        state.tips = tips.split() if tips else state.tips + scanned
+        state.results = _raw({**total.results, "findings": []})
+        state.findings = total.results["findings"].to_json()
+        state.save()
     
+    results = total.finish(project_path)
+    if results["status"].startswith("[OK]"):
+        results["status"] = "[OK] No secrets in history"
     return results
 
 
-def scan_configuration(project_path: str) -> Dict[str, Any]:
+# ============================================================================
+#  OFFLINE ADVISORIES
+# ============================================================================
+
+_SEMVER = re.compile(r'^v?(\d+)(?:\.(\d+))?(?:\.(\d+))?(?:-([0-9A-Za-z.-]+))?(?:\+[0-9A-Za-z.-]*)?$')
+_PEP440 = re.compile(r'^v?(?:(\d+)!)?(\d+(?:\.\d+)*)(?:[-_.]?(a|b|c|rc|alpha|beta|pre|preview)[-_.]?(\d*))?'
+                     r'(?:-(\d+)|[-_.]?(?:post|rev|r)[-_.]?(\d*))?(?:[-_.]?(dev)[-_.]?(\d*))?(?:\+[a-z0-9._]*)?$',
+                     re.IGNORECASE)
+_PRE_PHASES = {"a": 0, "alpha": 0, "b": 1, "beta": 1, "c": 2, "rc": 2, "pre": 2, "preview": 2}
+
+
+def _semver_key(version: str):
+    """Sort key of an npm (semver) version, or None; a release sorts after its pre-releases"""
+    m = _SEMVER.match(version.strip())
+    if not m:
+        return None
+    major, minor, patch, pre = m.groups()
+    release = (int(major), int(minor or 0), int(patch or 0))
+    if pre is None:
+        return release + ((1,),)
+    return release + ((0, *((0, int(p), "") if p.isdigit() else (1, 0, p) for p in pre.split("."))),)
+
+
+def _pep440_key(version: str):
+    """Sort key of a Python (PEP 440) version, or None: epoch, release, pre, post, dev"""
+    m = _PEP440.match(version.strip())
+    if not m:
+        return None
+    epoch, release, pre, pre_n, post, post_n, dev, dev_n = m.groups()
+    nums = [int(n) for n in release.split(".")]
+    while len(nums) > 1 and not nums[-1]:
+        nums.pop()
+    post = None if post is None and post_n is None else int(post or post_n or 0)
+    if pre:
+        pre_key = (1, _PRE_PHASES[pre.lower()], int(pre_n or 0))
+    else:
+        pre_key = (0, 0, 0) if dev and post is None else (2, 0, 0)  # 1.0.dev1 < 1.0a1 < 1.0
+    return (int(epoch or 0), tuple(nums), pre_key, (0, 0) if post is None else (1, post),
+            (1, 0) if dev is None else (0, int(dev_n or 0)))
+
+
+VERSION_KEYS = {"npm": _semver_key, "PyPI": _pep440_key}
+
+
+def _package_name(ecosystem: str, name: str) -> str:
+    """Names as the advisories spell them: PyPI's are case- and separator-insensitive"""
+    return re.sub(r"[-_.]+", "-", name).lower() if ecosystem == "PyPI" else name
+
+
+def _read_package_lock(path: Path):
+    """(name, version) of each package installed by an npm lockfile (v1 to v3)"""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    for key, entry in (data.get("packages") or {}).items():
+        if "node_modules/" in key and not entry.get("link") and entry.get("version"):
+            yield entry.get("name") or key.rsplit("node_modules/", 1)[1], entry["version"]
+    if not data.get("packages"):
+        stack = [data.get("dependencies") or {}]
+        while stack:
+            for name, entry in stack.pop().items():
+                if entry.get("version"):
+                    yield name, entry["version"]
+                stack.append(entry.get("dependencies") or {})
+
+
+_PNPM_KEY = re.compile(r"^/?((?:@[^/]+/)?[^/@]+)[@/](\d[^_(/:]*)")
+
+
+def _read_pnpm_lock(path: Path):
+    """(name, version) of the keys under packages: in a pnpm lockfile (v5 /name/1.0.0, v6+ name@1.0.0)"""
+    section = None
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line[:1] not in (" ", "\n"):
+                section = line.rstrip()
+            elif section == "packages:" and line.startswith("  ") and line[2:3] not in (" ", "#"):
+                m = _PNPM_KEY.match(line.strip().rstrip(":").strip("'\""))
+                if m:
+                    yield m.group(1), m.group(2)
+
+
+def _read_poetry_lock(path: Path):
+    """(name, version) of each [[package]] in a poetry lockfile"""
+    name = version = None
+    in_package = False
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.startswith("["):
+                if name and version:
+                    yield name, version
+                name = version = None
+                in_package = line.strip() == "[[package]]"
+            elif in_package and line.startswith(("name = ", "version = ")):
+                key, _, value = line.partition(" = ")
+                if key == "name":
+                    name = value.strip().strip('"')
+                else:
+                    version = value.strip().strip('"')
+    if name and version:
+        yield name, version
+
+
+LOCKFILE_READERS = {"package-lock.json": _read_package_lock, "npm-shrinkwrap.json": _read_package_lock,
+                    "pnpm-lock.yaml": _read_pnpm_lock, "poetry.lock": _read_poetry_lock}
+
+
+def _osv_sources(source: Path) -> List[Path]:
+    """The snapshot's files: a JSON file (one OSV record or a list), a zip of them (osv.dev's all.zip) or a directory"""
+    if source.is_dir():
+        return sorted(path for path in source.rglob("*") if path.suffix in (".json", ".zip"))
+    return [source]
+
+
+def _osv_records(path: Path):
+    """The OSV records in one snapshot file"""
+    if path.suffix == ".zip":
+        with zipfile.ZipFile(path) as archive:
+            for member in sorted(archive.namelist()):
+                if member.endswith(".json"):
+                    yield json.loads(archive.read(member))
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        yield from data if isinstance(data, list) else [data]
+
+
+class AdvisoryDB:
     """
-    Validate security configuration (OWASP A02).
-    Checks: Security headers, CORS, debug modes.
+    A local OSV advisory snapshot, indexed by package name. Reading a snapshot
+    (tens of thousands of small JSON records) is the slow part, so the index is
+    built once and kept in the cache directory until the snapshot's files change.
+    Only the packages asked for get their affected ranges compiled to version
+    sort keys: matching is then a few comparisons per lockfile entry, with no
+    network and the same answer every run.
     """
-    results = {
-        "tool": "config_scanner",
-        "findings": [],
-        "status": "[OK] Configuration secure",
-        "checks": {}
-    }
-    
-    # Check common config files for issues
-    config_issues = [
-        (r'"DEBUG"\s*:\s*true', "Debug mode enabled", "high"),
-        (r'debug\s*=\s*True', "Debug mode enabled", "high"),
-        (r'NODE_ENV.*development', "Development mode in config", "medium"),
-        (r'"CORS_ALLOW_ALL".*true', "CORS allow all origins", "high"),
-        (r'"Access-Control-Allow-Origin".*\*', "CORS wildcard", "high"),
-        (r'allowCredentials.*true.*origin.*\*', "Dangerous CORS combo", "critical"),
-    ]
-    
-    for root, dirs, files in os.walk(project_path):
-        dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
-        
-        for file in files:
-            ext = Path(file).suffix.lower()
-            if ext not in CONFIG_EXTENSIONS and file not in ['next.config.js', 'webpack.config.js', '.eslintrc.js']:
+
+    def __init__(self, source, packages: set):
+        self.index = {}  # (ecosystem, name) -> [(advisory, [(low, high, high inclusive)], exact versions)]
+        for key, advisories in self._load(Path(source)).items():
+            ecosystem, name = key.split(":", 1)
+            if (ecosystem, name) not in packages:
                 continue
-                
-            filepath = Path(root) / file
-            
+            for advisory_id, severity, summary, ranges, versions in sorted(advisories, key=lambda a: a[0]):
+                intervals = [interval for events in ranges
+                             for interval in self._compile(events, VERSION_KEYS[ecosystem])]
+                self.index.setdefault((ecosystem, name), []).append(
+                    ({"id": advisory_id, "severity": severity, "summary": summary}, intervals, set(versions)))
+
+    @staticmethod
+    def _load(source: Path) -> Dict[str, list]:
+        """"ecosystem:name" -> [[id, severity, summary, [range events], [versions]]], from the cache if current"""
+        files = _osv_sources(source)
+        stamp = [[str(path), path.stat().st_size, path.stat().st_mtime_ns] for path in files]
+        cache = _cache_file(source.resolve(), "advisories")
+        version = _rules_version()
+        data = _load_json(cache)
+        if data.get("version") == version and data.get("stamp") == stamp:
+            return data["packages"]
+        packages = {}
+        for path in files:
+            for record in _osv_records(path):
+                if record.get("withdrawn"):
+                    continue
+                severity = str((record.get("database_specific") or {}).get("severity", "medium")).lower()
+                summary = record.get("summary") or (record.get("details") or "")[:120]
+                for affected in record.get("affected", []):
+                    package = affected.get("package") or {}
+                    ecosystem = package.get("ecosystem")
+                    if ecosystem not in VERSION_KEYS:
+                        continue
+                    name = _package_name(ecosystem, package.get("name", ""))
+                    ranges = [rng.get("events", []) for rng in affected.get("ranges", [])
+                              if rng.get("type") in ("SEMVER", "ECOSYSTEM")]
+                    packages.setdefault(f"{ecosystem}:{name}", []).append(
+                        [record.get("id", "?"), ADVISORY_SEVERITIES.get(severity, "medium"), summary, ranges,
+                         affected.get("versions", [])])
+        _save_json(cache, {"version": version, "stamp": stamp, "packages": packages})
+        return packages
+
+    @staticmethod
+    def _compile(events: list, version_key) -> list:
+        """OSV range events -> (low, high, high inclusive) key intervals; None is unbounded"""
+        keyed = []
+        for event in events:
+            for kind in ("introduced", "fixed", "last_affected"):
+                if kind in event:
+                    key = None if event[kind] == "0" else version_key(event[kind])
+                    if key is not None or event[kind] == "0":
+                        keyed.append((key is not None, key or (), kind))
+        intervals, low = [], False
+        for _, key, kind in sorted(keyed):
+            if kind == "introduced":
+                low = key or None
+            elif low is not False:
+                intervals.append((low, key, kind == "last_affected"))
+                low = False
+        if low is not False:
+            intervals.append((low, None, False))
+        return intervals
+
+    def affected(self, ecosystem: str, name: str, version: str) -> List[Dict[str, Any]]:
+        """The advisories affecting name@version"""
+        found = []
+        key = VERSION_KEYS[ecosystem](version)
+        for advisory, ranges, versions in self.index.get((ecosystem, _package_name(ecosystem, name)), []):
+            if version in versions or key is not None and any(
+                    (low is None or key >= low) and (high is None or key < high or inclusive and key == high)
+                    for low, high, inclusive in ranges):
+                found.append(advisory)
+        return found
+
+
+def audit_lockfiles(project_path: str, source) -> Dict[str, Any]:
+    """
+    Offline dependency audit: the packages pinned in the project's lockfiles
+    against the OSV snapshot at source. Findings are sorted, one per package
+    version and advisory.
+    """
+    installed = {}  # lockfile -> sorted {(name, version)}
+    for lockfile, reader in LOCKFILE_READERS.items():
+        path = Path(project_path) / lockfile
+        if path.exists():
             try:
-                with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
-                    
-                    for pattern, issue, severity in config_issues:
-                        if re.search(pattern, content, re.IGNORECASE):
-                            results["findings"].append({
-                                "file": str(filepath.relative_to(project_path)),
-                                "issue": issue,
-                                "severity": severity
-                            })
-                            
-            except Exception:
-                pass
-    
-    # Check for security header configurations
-    header_files = ["next.config.js", "next.config.mjs", "middleware.ts", "nginx.conf"]
-    for hf in header_files:
-        hf_path = Path(project_path) / hf
-        if hf_path.exists():
-            results["checks"]["security_headers_config"] = True
-            break
-    else:
-        results["checks"]["security_headers_config"] = False
-        results["findings"].append({
-            "issue": "No security headers configuration found",
-            "severity": "medium",
-            "recommendation": "Configure CSP, HSTS, X-Frame-Options headers"
-        })
-    
-    if any(f["severity"] == "critical" for f in results["findings"]):
-        results["status"] = "[!!] CRITICAL: Configuration issues"
-    elif any(f["severity"] == "high" for f in results["findings"]):
-        results["status"] = "[!] HIGH: Configuration review needed"
-    elif results["findings"]:
-        results["status"] = "[?] Minor configuration issues"
-    
-    return results
+                installed[lockfile] = sorted(set(reader(path)))
+            except (OSError, ValueError, AttributeError):
+                installed[lockfile] = []
+    db = AdvisoryDB(source, {(LOCKFILE_ECOSYSTEMS[lockfile], _package_name(LOCKFILE_ECOSYSTEMS[lockfile], name))
+                             for lockfile, packages in installed.items() for name, _ in packages})
+    findings = []
+    severity_count = {"critical": 0, "high": 0, "medium": 0, "low": 0}
+    for lockfile, packages in installed.items():
+        for name, version in packages:
+            for advisory in db.affected(LOCKFILE_ECOSYSTEMS[lockfile], name, version):
+                severity_count[advisory["severity"]] += 1
+                findings.append({
+                    "type": "Vulnerable dependency",
+                    "severity": advisory["severity"],
+                    "file": lockfile,
+                    "package": name,
+                    "version": version,
+                    "advisory": advisory["id"],
+                    "message": f"{name}@{version}: {advisory['summary']} ({advisory['id']})"
+                })
+    return {"findings": findings, "severity_count": severity_count,
+            "packages": sum(len(packages) for packages in installed.values())}
 
 
 # ============================================================================
 #  MAIN
 # ============================================================================
 
-def run_full_scan(project_path: str, scan_type: str = "all") -> Dict[str, Any]:
-    """Execute security validation scans."""
+def _print_event(event: Dict[str, Any]):
+    """Progress/finding event as one JSON line, for an orchestrator that set AG_KIT_EVENTS"""
+    print(json.dumps(event, default=str), flush=True)
+
+
+def run_full_scan(project_path: str, scan_type: str = "all", index=None, emit=None,
+                  workers: int = 1, memo=None, max_size: int = MAX_FILE_SIZE,
+                  history: Optional[str] = None, history_state: Optional[HistoryState] = None,
+                  advisories=None, sink=None) -> Dict[str, Any]:
+    """
+    Execute security validation scans (index: optional shared project index).
+    The file scanners share one walk, reading each file once, in up to
+    `workers` processes; memo (ScanCache / FileMemo) skips unchanged files.
+    Files over max_size bytes are reported as too large instead of scanned.
+    history, a git ref, adds a secret scan of the commits reachable from it,
+    resuming from history_state. advisories (a local OSV snapshot) audits
+    the lockfiles offline instead of running npm audit.
+    emit, if given, receives progress and metric events after each scanner, and
+    finding events as findings come; so does sink(scan, finding), with every finding.
+    Reports list each scan's most severe findings; the summary counts all of them.
+    """
     
     report = {
         "project": project_path,
@@ -385,27 +1523,61 @@ def run_full_scan(project_path: str, scan_type: str = "all") -> Dict[str, Any]:
         }
     }
     
+    # Classes are file scanners: they share one walk of the project, run at the first of them
     scanners = {
-        "deps": ("dependencies", scan_dependencies),
-        "secrets": ("secrets", scan_secrets),
-        "patterns": ("code_patterns", scan_code_patterns),
-        "config": ("configuration", scan_configuration),
+        "deps": ("dependencies", partial(scan_dependencies, advisories=advisories)),
+        "secrets": ("secrets", SecretScanner),
+        "patterns": ("code_patterns", CodePatternScanner),
+        "config": ("configuration", ConfigScanner),
     }
     
-    for key, (name, scanner) in scanners.items():
-        if scan_type == "all" or scan_type == key:
-            result = scanner(project_path)
-            report["scans"][name] = result
-            
-            findings_count = len(result.get("findings", []))
-            report["summary"]["total_findings"] += findings_count
-            
+    selected = [(name, scanner) for key, (name, scanner) in scanners.items()
+                if scan_type == "all" or scan_type == key]
+    
+    def sink_for(name):
+        def send(finding):
+            if emit:
+                emit({"event": "finding", "scan": name, **finding})
+            if sink:
+                sink(name, finding)
+        return send if emit or sink else None
+    
+    if history:
+        selected.append(("history", lambda path, index: scan_history(path, history, history_state, max_size,
+                                                                     sink_for("history"))))
+    file_scanners = [(name, scanner) for name, scanner in selected if isinstance(scanner, type)]
+    file_results = {}
+    
+    for step, (name, scanner) in enumerate(selected, 1):
+        if isinstance(scanner, type):
+            if not file_results:
+                if emit:
+                    emit({"event": "progress", "done": step - 1, "total": len(selected),
+                          "message": ", ".join(n for n, _ in file_scanners)})
+                results = _scan_files(project_path, [cls() for _, cls in file_scanners], index, workers, memo,
+                                      max_size, [sink_for(n) for n, _ in file_scanners])
+                file_results = dict(zip((n for n, _ in file_scanners), results))
+            result = file_results[name]
+        else:
+            if emit:
+                emit({"event": "progress", "done": step - 1, "total": len(selected), "message": name})
+            result = scanner(project_path, index)
+        report["scans"][name] = result
+        counts = result.get("finding_counts")
+        if counts is None:  # a scan that reports all its findings (deps)
+            send = sink_for(name)
+            counts = {}
             for finding in result.get("findings", []):
+                if send:
+                    send(finding)
                 sev = finding.get("severity", "low")
-                if sev == "critical":
-                    report["summary"]["critical"] += 1
-                elif sev == "high":
-                    report["summary"]["high"] += 1
+                counts[sev] = counts.get(sev, 0) + 1
+        if emit and "scanned_files" in result:
+            emit({"event": "metric", "name": f"{name}.scanned_files", "value": result["scanned_files"]})
+        
+        report["summary"]["total_findings"] += sum(counts.values())
+        report["summary"]["critical"] += counts.get("critical", 0)
+        report["summary"]["high"] += counts.get("high", 0)
     
     # Determine overall status
     if report["summary"]["critical"] > 0:
@@ -418,6 +1590,20 @@ def run_full_scan(project_path: str, scan_type: str = "all") -> Dict[str, Any]:
     return report
 
 
+def run(project_path, context: dict = None) -> Dict[str, Any]:
+    """
+    In-process entry point used by checklist.py / verify_all.py.
+    Like the CLI, findings are reported but never fail the check.
+    context["memo"], if given, serves unchanged files from the last run.
+    $AG_KIT_ADVISORIES, if set, is the OSV snapshot for an offline dependency audit.
+    """
+    context = context or {}
+    report = run_full_scan(str(project_path), index=context.get("index"), emit=context.get("emit"),
+                           memo=context.get("memo"), advisories=os.environ.get("AG_KIT_ADVISORIES"))
+    report["passed"] = True
+    return report
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Validate security principles from vulnerability-scanner skill"
@@ -427,6 +1613,23 @@ def main():
                         default="all", help="Type of scan to run")
     parser.add_argument("--output", choices=["json", "summary"], default="json",
                         help="Output format")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Processes scanning files in parallel (0 = one per CPU, default: 1)")
+    parser.add_argument("--max-file-size", type=float, default=MAX_FILE_SIZE / 1024 / 1024, metavar="MB",
+                        help="Report larger files as too large instead of scanning them "
+                             f"(default: {MAX_FILE_SIZE // 1024 // 1024})")
+    parser.add_argument("--history", nargs="?", const="HEAD", metavar="REF",
+                        help="Also scan the git history reachable from REF (default: HEAD) for secrets, "
+                             "resuming after the commits scanned last time")
+    parser.add_argument("--advisories", metavar="PATH", default=os.environ.get("AG_KIT_ADVISORIES"),
+                        help="Audit lockfiles offline against this OSV advisory snapshot (JSON file, zip "
+                             "such as osv.dev's all.zip, or a directory of them) instead of npm audit "
+                             "(default: $AG_KIT_ADVISORIES)")
+    parser.add_argument("--findings-jsonl", metavar="FILE",
+                        help="Write every finding, one JSON object per line with its \"scan\", to FILE "
+                             "(the report lists only the most severe of each scan)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Rescan every file (and the whole history) instead of reusing earlier results")
     
     args = parser.parse_args()
     
@@ -434,7 +1637,22 @@ def main():
         print(json.dumps({"error": f"Directory not found: {args.project_path}"}))
         sys.exit(1)
     
-    result = run_full_scan(args.project_path, args.scan_type)
+    emit = _print_event if os.environ.get("AG_KIT_EVENTS") else None
+    workers = args.workers or os.cpu_count() or 1
+    max_size = int(args.max_file_size * 1024 * 1024)
+    cache = None if args.no_cache else ScanCache(args.project_path, args.scan_type, max_size)
+    history_state = HistoryState(args.project_path, max_size, persist=not args.no_cache) if args.history else None
+    out = open(args.findings_jsonl, "w", encoding="utf-8") if args.findings_jsonl else None
+    sink = (lambda scan, finding: out.write(json.dumps({"scan": scan, **finding}, default=str) + "\n")) if out else None
+    try:
+        result = run_full_scan(args.project_path, args.scan_type, emit=emit, workers=workers, memo=cache,
+                               max_size=max_size, history=args.history, history_state=history_state,
+                               advisories=args.advisories, sink=sink)
+    finally:
+        if out:
+            out.close()
+    if cache:
+        cache.save()
     
     if args.output == "summary":
         print(f"\n{'='*60}")